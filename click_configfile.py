@@ -9,12 +9,57 @@ that already use click_ for command-line processing.
 """
 
 from __future__ import absolute_import, print_function
-from fnmatch import fnmatch
+from collections import OrderedDict
+from functools import partial
+import io
 import os.path
-import inspect
-import configparser     # -- USE BACKPORT FOR: Python2
-from click.types import convert_type
-import six
+import sys
+import types
+import threading
+import time
+import weakref
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:     # pragma: no cover
+    from collections import Mapping, Sequence   # -- PYTHON2
+
+# -- LAZY IMPORTS: To keep the import time low (for example for "--help").
+#   click, click.types  -- Needed on first Param construction.
+#   configparser        -- Needed on first read_config() (USE BACKPORT: Python2)
+#   fnmatch, re         -- Needed when config section names are matched.
+
+# -- PYTHON2/PYTHON3 COMPATIBILITY (without six):
+if sys.version_info[0] == 2:    # pragma: no cover
+    # pylint: disable=undefined-variable
+    string_types = (basestring,)
+    integer_types = (int, long)
+    class_types = (type, types.ClassType)
+else:
+    string_types = (str,)
+    integer_types = (int,)
+    class_types = (type,)
+
+
+# -- LAZY IMPORTS: Cached accessor for functions/classes in hot paths.
+_lazy_imports = {}
+
+
+def lazy_import(module_name, name):
+    """Provides a function/class of a lazily imported module.
+    The module is imported on first use, the result is cached
+    (cheaper than an import statement in functions that are called often).
+
+    .. sourcecode::
+
+        fnmatch = lazy_import("fnmatch", "fnmatch")
+    """
+    key = (module_name, name)
+    value = _lazy_imports.get(key)
+    if value is None:
+        from importlib import import_module
+        value = getattr(import_module(module_name), name)
+        _lazy_imports[key] = value
+    return value
 
 # -----------------------------------------------------------------------------
 # PACKAGE META DATA:
@@ -55,7 +100,7 @@ def matches_section(section_name):
         ...
     """
     section_names = section_name
-    if isinstance(section_name, six.string_types):
+    if isinstance(section_name, string_types):
         section_names = [section_name]
     elif not isinstance(section_name, (list, tuple)):
         raise ValueError("%r (expected: string, strings)" % section_name)
@@ -142,6 +187,7 @@ class SectionSchema(object):
         :return: True, if this schema can be applied to the config section.
         :return: Fals, if this schema does not match the config section.
         """
+        fnmatch = lazy_import("fnmatch", "fnmatch")
         if supported_section_names is None:
             supported_section_names = getattr(cls, "section_names", None)
 
@@ -154,6 +200,109 @@ class SectionSchema(object):
 
 
 
+# -----------------------------------------------------------------------------
+# SUPPORT: CONVERSION CACHE
+# -----------------------------------------------------------------------------
+_cacheable_param_types = None
+
+
+def select_cacheable_param_types():
+    """Provides the pure click types: Their conversion result depends only
+    on the text (no side effects).
+    The types are imported once (used for each cached conversion).
+    """
+    global _cacheable_param_types   # pylint: disable=global-statement
+    if _cacheable_param_types is None:
+        from click.types import StringParamType, IntParamType, \
+            FloatParamType, BoolParamType, UUIDParameterType, Choice
+        _cacheable_param_types = (StringParamType, IntParamType,
+                                  FloatParamType, BoolParamType,
+                                  UUIDParameterType, Choice)
+    return _cacheable_param_types
+
+
+def is_cacheable_type(param_type):
+    """Indicates if the conversion results of a click type can be cached.
+    Pure click types are cacheable. Other types (like: :class:`click.Path`)
+    must be declared cacheable by setting their ``cacheable`` attribute.
+
+    .. sourcecode::
+
+        path_type = click.Path(exists=True)
+        path_type.cacheable = True  # -- ACCEPT: Stale filesystem checks.
+
+    :param param_type:  Click type to check (as ParamType object).
+    :return: True, if conversion results can be cached.
+    """
+    cacheable = getattr(param_type, "cacheable", None)
+    if cacheable is not None:
+        return bool(cacheable)
+    return isinstance(param_type, select_cacheable_param_types())
+
+
+class ConversionCache(object):
+    """Bounded LRU cache for conversion results of :meth:`Param.parse()`.
+    Cache entries are keyed by ``(param_type, text)``.
+    Only cacheable types are cached (see :func:`is_cacheable_type()`).
+
+    .. sourcecode::
+
+        # -- ENABLE (opt-in): For all params or for one param.
+        Param.conversion_cache = ConversionCache(maxsize=4096)
+        numbers = Param(type=int, multiple=True, cache=ConversionCache())
+    """
+    DEFAULT_MAXSIZE = 1024
+
+    def __init__(self, maxsize=None):
+        if maxsize is None:
+            maxsize = self.DEFAULT_MAXSIZE
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def convert(self, param_type, text, param=None):
+        """Convert the text with the param type (or use cached result).
+
+        :param param_type:  Click type to use for the conversion.
+        :param text:        Text to convert.
+        :param param:       Param that uses the type (for error reporting).
+        :return: Converted value.
+        :raises: click.BadParameter, if conversion error occurs.
+        """
+        key = (param_type, text)
+        with self._lock:
+            if key in self._data:
+                # -- LRU: Mark as most recently used.
+                value = self._data.pop(key)
+                self._data[key] = value
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = param_type.convert(text, param, ctx=None)
+        with self._lock:
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Provides the cache statistics (as dict)."""
+        return dict(hits=self.hits, misses=self.misses,
+                    size=len(self._data), maxsize=self.maxsize)
+
+
 class Param(object):
     """Simple Parameter class used for description config file schema params.
     Simple replacement for :class:`click.Parameter` or its variants.
@@ -166,6 +315,7 @@ class Param(object):
             flag    = Param(type=bool, default=True)
             numbers = Param(type=int, multiple=True)
             filenames = Param(type=click.Path(), multiple=True)
+            allowlist = Param(type=str, multiple=True, lazy=True)
 
     .. sourcecode:: ini
 
@@ -178,51 +328,488 @@ class Param(object):
             bar/baz/zzz.txt
     """
     # pylint: disable=redefined-builtin
+    conversion_cache = None     # OPTIONAL: ConversionCache (opt-in).
 
     def __init__(self, name=None, type=None, multiple=None, default=None,
-                 help=None):
+                 help=None, cache=None, indexed=False, lazy=False,
+                 cache_membership=False):
+        from click.types import convert_type
         self.name = name
         self.type = convert_type(type, default)
         self.multiple = multiple
         self.default = default
         self.help = help
+        self.indexed = indexed
+        self.lazy = lazy
+        self.cache_membership = cache_membership
+        if cache is not None:
+            self.conversion_cache = cache
+
+    def convert(self, text):
+        """Convert one text value into the type of this param.
+        Uses the conversion cache, if it is enabled and the type is cacheable.
+        """
+        cache = self.conversion_cache
+        if cache is None or not is_cacheable_type(self.type):
+            return self.type.convert(text, self, ctx=None)
+        return cache.convert(self.type, text, self)
 
-    def parse(self, text):
-        if self.multiple:
+    def parse(self, text, convert=None):
+        """Parse the text of a config file param and convert its value(s).
+
+        :param text:    Text to parse.
+        :param convert: Optional conversion function to use (for one value).
+        :return: Converted value (or list of values, if multiple).
+        :return: LazySequence, if multiple and lazy.
+        """
+        if convert is None:
+            convert = self.convert
+        if self.multiple and self.lazy:
+            return LazySequence(text, convert, self.cache_membership)
+        elif self.multiple:
             parts = text.strip().split()
-            values = [self.type.convert(value, self, ctx=None)
-                      for value in parts]
+            values = [convert(value) for value in parts]
             return values
         else:
-            return self.type.convert(text, self, ctx=None)
+            return convert(text)
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: BATCHED PATH VALIDATION
+# -----------------------------------------------------------------------------
+def is_path_type(param_type):
+    """Indicates if the click type checks the filesystem during conversion
+    (without opening files, unlike :class:`click.File`).
+    """
+    return isinstance(param_type, lazy_import("click", "Path"))
+
+
+class PathValidationBatch(object):
+    """Validates the values of path-typed params (:class:`click.Path`)
+    together in a thread pool instead of one after another while the
+    config sections are parsed.
+    Each distinct ``(param_type, text)`` value is validated only once.
+    :class:`click.File` params are not batched: Each value needs its own
+    file object (and should not be opened on a pool thread).
+
+    .. sourcecode::
+
+        batch = PathValidationBatch()
+        batch.add(param, text)      # -- COLLECT: Values of all sections.
+        batch.validate()            # -- VALIDATE: Collected values together.
+        convert = batch.converter_for(section_name, name, param)
+        value = param.parse(text, convert=convert)
+        # -- FAILS WITH: click.BadParameter for "{section_name}.{name}".
+
+    If ``profile`` is true, the validation time of each value is recorded.
+    It is claimed (once) by the param that uses the value first
+    (see: :meth:`claim_duration()`).
+    """
+    clock = getattr(time, "perf_counter", time.time)
+
+    def __init__(self, max_workers=None, profile=False):
+        self.max_workers = max_workers
+        self.profile = profile
+        self._pending = OrderedDict()   # MAPS: (param_type, text) -> param
+        self._results = {}              # MAPS: (param_type, text) -> result
+        self._durations = {}            # MAPS: (param_type, text) -> seconds
+
+    def __len__(self):
+        return len(self._pending)
+
+    @staticmethod
+    def accepts(param):
+        return is_path_type(param.type)
+
+    def add(self, param, text):
+        """Collect the path value(s) of a param for the validation stage."""
+        if param.multiple:
+            # -- EAGER: Also for lazy params (LazySequence converts later).
+            for part in text.split():
+                self._add_value(param, part)
+        else:
+            self._add_value(param, text)
+
+    def _add_value(self, param, text):
+        key = (param.type, text)
+        if key not in self._pending:
+            self._pending[key] = param
+
+    def _validate_value(self, key):
+        bad_parameter = lazy_import("click", "BadParameter")
+        param_type, text = key
+        start_time = self.clock() if self.profile else None
+        try:
+            return (param_type.convert(text, self._pending[key], None), None)
+        except bad_parameter as e:
+            return (None, e)
+        finally:
+            if self.profile:
+                self._durations[key] = self.clock() - start_time
+
+    def validate(self):
+        """Validate all collected values (that are not validated yet)."""
+        keys = [key for key in self._pending if key not in self._results]
+        if len(keys) <= 1 or self.max_workers == 1:
+            results = [self._validate_value(key) for key in keys]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(self._validate_value, keys))
+        self._results.update(zip(keys, results))
+
+    def lookup(self, section_name, name, param, text):
+        """Provides the validated value for the text of a param.
+
+        :raises: click.BadParameter, if the validation failed.
+        """
+        value, error = self._results[(param.type, text)]
+        if error is not None:
+            import click
+            param_hint = "%s.%s" % (section_name, name)
+            raise click.BadParameter(error.message, param_hint=param_hint)
+        return value
+
+    def claim_duration(self, param, text):
+        """Provides the validation time of the path value(s) of a param
+        (in seconds). Each value is claimed only once (shared values count
+        only for the first param that uses them).
+        """
+        parts = [text]
+        if param.multiple:
+            parts = text.split()
+        return sum(self._durations.pop((param.type, part), 0.0)
+                   for part in parts)
+
+    def converter_for(self, section_name, name, param):
+        """Provides the conversion function for a param (or None)."""
+        if not self.accepts(param):
+            return None
+        return partial(self.lookup, section_name, name, param)
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: LAZY FILES
+# -----------------------------------------------------------------------------
+class LazyConfigFile(object):
+    """File handle for a :class:`click.File` param that opens the file
+    on first use (read, write, iteration, ...).
+    Similar to :class:`click.utils.LazyFile` but without any I/O until then.
+    """
+
+    def __init__(self, name, mode="r", encoding=None, errors="strict",
+                 atomic=False):
+        self.name = name
+        self.mode = mode
+        self.encoding = encoding
+        self.errors = errors
+        self.atomic = atomic
+        self._f = None
+        self._closed = False
+
+    @property
+    def opened(self):
+        """Indicates if the file was opened (by using it)."""
+        return self._f is not None
+
+    @property
+    def closed(self):
+        """Indicates if the file was closed (without opening it)."""
+        return self.__dict__.get("_closed", False)
+
+    def open(self):
+        """Open the file (once) and provide the real file object.
+
+        :raises ValueError: If the file was already closed.
+        """
+        if self._f is None:
+            import click
+            if self.closed:
+                raise ValueError("I/O operation on closed file: %s" % self.name)
+            self._f = click.open_file(self.name, self.mode,
+                                      encoding=self.encoding,
+                                      errors=self.errors, atomic=self.atomic)
+        return self._f
+
+    def close(self):
+        """Close the file (if it was opened)."""
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+        self._closed = True
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            # -- NOT FORWARDED: Private/dunder names (copy, pickle, ...).
+            raise AttributeError(name)
+        return getattr(self.open(), name)
+
+    def __iter__(self):
+        return iter(self.open())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        state = "opened"
+        if self.closed:
+            state = "closed"
+        elif self._f is None:
+            state = "not opened"
+        return "<%s %r mode=%r (%s)>" % (self.__class__.__name__, self.name,
+                                         self.mode, state)
+
+
+def open_lazy_file(param, text):
+    """Converts the text of a :class:`click.File` param into a lazy file.
+    The standard streams (``-``) are provided as usual.
+    """
+    file_type = param.type
+    if text == "-":
+        return file_type.convert(text, param, None)
+    return LazyConfigFile(text, file_type.mode, encoding=file_type.encoding,
+                          errors=file_type.errors, atomic=file_type.atomic)
+
+
+def convert_tracked_lazy_file(convert, lazy_files, text):
+    """Converts a text (like: the item of a :class:`LazySequence`) and
+    remembers the created :class:`LazyConfigFile` in :param:`lazy_files`
+    (to close it later).
+    """
+    value = convert(text)
+    if isinstance(value, LazyConfigFile):
+        lazy_files.add(value)
+    return value
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: LAZY SEQUENCES
+# -----------------------------------------------------------------------------
+class LazySequence(Sequence):
+    """Read-only sequence for the values of a huge ``multiple=True`` param.
+    The token boundaries of the text are scanned once into compact offset
+    arrays. Items are sliced from the text and converted on access.
+    Conversion errors (click.BadParameter) occur on access.
+
+    .. sourcecode::
+
+        class FooSchema(SectionSchema):
+            allowlist = Param(type=str, multiple=True, lazy=True,
+                              cache_membership=True)
+
+        allowlist = storage["allowlist"]
+        if "alice" in allowlist:    # -- Uses a set (built on first lookup).
+            ...
+
+    :param text:    Text with whitespace-separated values.
+    :param convert: Conversion function (for one value).
+    :param cache_membership: If true, membership lookups use a set of the
+        converted values (built once).
+    """
+    __slots__ = ("text", "convert", "starts", "ends", "cache_membership",
+                 "_members")
+
+    def __init__(self, text, convert, cache_membership=False):
+        from array import array
+        import re
+        typecode = "I" if len(text) <= 0xFFFFFFFF else "Q"
+        self.text = text
+        self.convert = convert
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self.cache_membership = cache_membership
+        self._members = None
+        for match in re.finditer(r"\S+", text):
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LazySequence index out of range: %s" % index)
+        return self.convert(self.text[self.starts[index]:self.ends[index]])
+
+    def __iter__(self):
+        text = self.text
+        convert = self.convert
+        for start, end in zip(self.starts, self.ends):
+            yield convert(text[start:end])
+
+    def __contains__(self, value):
+        if not self.cache_membership:
+            return any(item == value for item in self)
+        members = self._members
+        if members is None:
+            members = self._members = frozenset(self)
+        return value in members
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, LazySequence)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<LazySequence: %d items>" % len(self)
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: CONVERSION PROFILER
+# -----------------------------------------------------------------------------
+class ConversionProfiler(object):
+    """Records the conversion costs of :meth:`Param.parse()` calls
+    per (schema, param) and per config section
+    (call counts, cumulative time and worst-case time).
+    The time of a batched path validation is added to the param
+    (see: :class:`PathValidationBatch`).
+
+    .. sourcecode::
+
+        class ConfigFileProcessor(ConfigFileReader):
+            profile_conversions = True
+
+        storage = ConfigFileProcessor.read_config()
+        for entry in ConfigFileProcessor.stats["conversions"]["params"][:10]:
+            print("%(schema)s.%(param)s: %(total)f sec" % entry)
+    """
+    clock = getattr(time, "perf_counter", time.time)
+
+    def __init__(self):
+        self.params = OrderedDict()     # MAPS: (schema, param) -> entry
+        self.sections = OrderedDict()   # MAPS: section name -> entry
+
+    @staticmethod
+    def make_entry(**kwargs):
+        entry = dict(calls=0, total=0.0, worst=0.0)
+        entry.update(kwargs)
+        return entry
+
+    def add_section(self, section_name, schema):
+        if section_name not in self.sections:
+            schema_name = getattr(schema, "__qualname__", schema.__name__)
+            self.sections[section_name] = self.make_entry(
+                section=section_name, schema=schema_name)
+
+    def record(self, section_name, schema, param_name, duration):
+        """Records the duration of one conversion (in seconds)."""
+        schema_name = getattr(schema, "__qualname__", schema.__name__)
+        self.add_section(section_name, schema)
+        key = (schema_name, param_name)
+        param_entry = self.params.get(key, None)
+        if param_entry is None:
+            param_entry = self.params[key] = self.make_entry(
+                schema=schema_name, param=param_name)
+        for entry in (param_entry, self.sections[section_name]):
+            entry["calls"] += 1
+            entry["total"] += duration
+            entry["worst"] = max(entry["worst"], duration)
+
+    def top(self, count=None):
+        """Provides the most expensive params (by cumulative time)."""
+        entries = sorted(self.params.values(),
+                         key=lambda entry: entry["total"], reverse=True)
+        return entries[:count]
+
+    def report(self):
+        """Provides the profile (entries sorted by cumulative time)."""
+        sections = sorted(self.sections.values(),
+                          key=lambda entry: entry["total"], reverse=True)
+        return dict(params=self.top(), sections=sections)
 
 
 # -----------------------------------------------------------------------------
 # PARSING CONFIG SECTIONS WITH SCHEMA DESCRIPTION
 # -----------------------------------------------------------------------------
+class BulkConfigSection(object):
+    """Config section that retrieves all its raw values with one bulk call
+    (instead of one ``SectionProxy.get()`` call per param).
+    Only values with interpolation markers are interpolated.
+    Interpolated values are memoized (per config file load).
+    Can be used instead of a SectionProxy in :func:`parse_config_section()`.
+    """
+    INTERPOLATION_MARKERS = ("%", "$")
+
+    def __init__(self, parser, name, interpolation_memo=None,
+                 interpolation=True):
+        if interpolation_memo is None:
+            interpolation_memo = {}
+        self.parser = parser
+        self.name = name
+        self.values = dict(parser.items(name, raw=True))
+        self.interpolation = interpolation
+        self.interpolation_memo = interpolation_memo
+
+    def __contains__(self, option):
+        return option in self.values
+
+    def get(self, option, default=None):
+        value = self.values.get(option, None)
+        if value is None:
+            return default
+        elif not self.interpolation or \
+                not any(marker in value for marker in
+                        self.INTERPOLATION_MARKERS):
+            return value
+
+        key = (self.name, option)
+        interpolated_value = self.interpolation_memo.get(key, None)
+        if interpolated_value is None:
+            interpolated_value = self.parser.get(self.name, option)
+            self.interpolation_memo[key] = interpolated_value
+        return interpolated_value
+
+
 def select_params_from_section_schema(section_schema, param_class=Param,
-                                      deep=False):
+                                      deep=False, names=None):
     """Selects the parameters of a config section schema.
 
     :param section_schema:  Configuration file section schema to use.
+    :param names:   Optional param names of interest (projection).
+                    If provided, other params are skipped.
     :return: Generator of params
     """
     # pylint: disable=invalid-name
-    for name, value in inspect.getmembers(section_schema):
-        if name.startswith("__") or value is None:
+    for name in dir(section_schema):
+        if name.startswith("__"):
+            continue
+        try:
+            value = getattr(section_schema, name)
+        except AttributeError:  # pragma: no cover
+            continue
+        if value is None:
             continue    # pragma: no cover
-        elif inspect.isclass(value) and deep:
+        elif isinstance(value, class_types) and deep:
             # -- CASE: class => SELF-CALL (recursively).
             # pylint: disable= bad-continuation
             cls = value
             for name, value in select_params_from_section_schema(cls,
-                                            param_class=param_class, deep=True):
+                                            param_class=param_class, deep=True,
+                                            names=names):
                 yield (name, value)
         elif isinstance(value, param_class):
+            if names is not None and name not in names:
+                continue
             yield (name, value)
 
 
-def parse_config_section(config_section, section_schema):
+def parse_config_section(config_section, section_schema, keys=None,
+                         batch=None, lazy_files=False, profiler=None):
     """Parse a config file section (INI file) by using its schema/description.
 
     .. sourcecode::
@@ -256,28 +843,1076 @@ def parse_config_section(config_section, section_schema):
 
     :param config_section:  Config section to parse
     :param section_schema:  Schema/description of config section (w/ Param).
+    :param keys:    Optional param names to retrieve (projection).
+                    Other params are neither parsed nor converted.
+    :param batch:   Optional, already validated :class:`PathValidationBatch`.
+    :param lazy_files:  If true, :class:`click.File` params provide
+                        :class:`LazyConfigFile` objects (opened on first use).
+    :param profiler:    Optional :class:`ConversionProfiler` to use.
     :return: Retrieved data, values converted to described types.
     :raises: click.BadParameter, if conversion error occurs.
     """
+    file_type = lazy_import("click", "File")
     storage = {}
-    for name, param in select_params_from_section_schema(section_schema):
+    if profiler is not None:
+        profiler.add_section(config_section.name, section_schema)
+    for name, param in select_params_from_section_schema(section_schema,
+                                                         names=keys):
         value = config_section.get(name, None)
         if value is None:
             if param.default is None:
                 continue
             value = param.default
         else:
-            value = param.parse(value)
+            convert = None
+            batched = False
+            if lazy_files and isinstance(param.type, file_type):
+                convert = partial(open_lazy_file, param)
+            elif batch is not None:
+                convert = batch.converter_for(config_section.name, name, param)
+                batched = convert is not None
+            if profiler is not None:
+                text = value
+                start_time = profiler.clock()
+                value = param.parse(value, convert=convert)
+                duration = profiler.clock() - start_time
+                if batched:
+                    # -- BATCH VALIDATION: Happened before (in thread pool).
+                    duration += batch.claim_duration(param, text)
+                profiler.record(config_section.name, section_schema, name,
+                                duration)
+            else:
+                value = param.parse(value, convert=convert)
         # -- DIAGNOSTICS:
         # print("  %s = %s" % (name, repr(value)))
         storage[name] = value
     return storage
 
 
+# -----------------------------------------------------------------------------
+# SUPPORT: SECTION RECORDS
+# -----------------------------------------------------------------------------
+class SectionRecord(object):
+    """Base class for compact section records (with one slot per param).
+    Params without a value are missing (like in a dict).
+    Only dunder/underscore methods are used to avoid conflicts with params.
+
+    .. sourcecode::
+
+        record = storage["alice"]
+        assert record.numbers == record["numbers"]
+        assert "numbers" in record
+        data = record._asdict()
+    """
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, name):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        return name in self.__slots__ and hasattr(self, name)
+
+    def __iter__(self):
+        for name in self.__slots__:
+            if hasattr(self, name):
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, SectionRecord):
+            other = other._asdict()
+        elif not isinstance(other, Mapping):
+            return NotImplemented
+        return self._asdict() == dict(other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        params = ", ".join("%s=%r" % (name, getattr(self, name))
+                           for name in self)
+        return "%s(%s)" % (self.__class__.__name__, params)
+
+    def _asdict(self):
+        return OrderedDict((name, getattr(self, name)) for name in self)
+
+
+class SectionRecordMapping(Mapping):
+    """Mapping adapter for a :class:`SectionRecord` (read-only).
+    Provides the dict-like API (get, keys, items, ...) for click.
+    """
+
+    def __init__(self, record):
+        self.record = record
+
+    def __getitem__(self, name):
+        return self.record[name]
+
+    def __iter__(self):
+        return iter(self.record)
+
+    def __len__(self):
+        return len(self.record)
+
+
+def make_section_record_class(section_schema):
+    """Provides the :class:`SectionRecord` class for a config section schema
+    (generated once per schema).
+
+    :param section_schema:  Config section schema with params.
+    :return: Record class with one slot per param.
+    """
+    record_class = section_schema.__dict__.get("_section_record_class", None)
+    if record_class is None:
+        names = tuple(name for name, _ in
+                      select_params_from_section_schema(section_schema))
+        class_name = "%sRecord" % section_schema.__name__
+        record_class = type(class_name, (SectionRecord,),
+                            dict(__slots__=names))
+        section_schema._section_record_class = record_class
+    return record_class
+
+
+def make_default_map(storage):
+    """Provides the storage with section records as click ``default_map``.
+
+    .. sourcecode::
+
+        storage = ConfigFileProcessor.read_config()
+        CONTEXT_SETTINGS = dict(default_map=make_default_map(storage))
+    """
+    default_map = {}
+    for name, value in storage.items():
+        if isinstance(value, SectionRecord):
+            value = SectionRecordMapping(value)
+        default_map[name] = value
+    return default_map
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: SECTION COLUMNS
+# -----------------------------------------------------------------------------
+_MISSING = object()     # MARKER: Param has no value in a config section.
+
+
+class SectionRowView(Mapping):
+    """Lightweight, read-only view of one row in :class:`SectionColumns`
+    (provides the dict-style access to the params of one config section).
+    """
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns, row):
+        self._columns = columns
+        self._row = row
+
+    def __getitem__(self, name):
+        column = self._columns.columns.get(name, None)
+        if column is None or column[self._row] is _MISSING:
+            raise KeyError(name)
+        return column[self._row]
+
+    def __iter__(self):
+        row = self._row
+        for name, column in self._columns.columns.items():
+            if column[row] is not _MISSING:
+                yield name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return "<%s %r: %r>" % (self.__class__.__name__,
+                                self._columns.names[self._row], dict(self))
+
+
+class SectionColumns(Mapping):
+    """Columnar storage for many config sections with the same schema
+    (like: ``hello.more.*``). Stores one list per param and a name index.
+    Provides the rows as :class:`SectionRowView` (by storage name).
+
+    .. sourcecode::
+
+        hosts = storage["hello.host.*"]
+        ports = hosts.column("port")
+        db_hosts = hosts.where(role="db")
+        high_ports = hosts.filter("port", lambda port: port > 8000)
+        assert hosts["hello.host.alice"]["port"] == 8000
+    """
+
+    def __init__(self, section_schema):
+        self.section_schema = section_schema
+        self.names = []     # Storage name per row.
+        self.index = {}     # MAPS: storage name -> row
+        self.columns = OrderedDict(
+            (name, []) for name, _ in
+            select_params_from_section_schema(section_schema))
+
+    def __getitem__(self, name):
+        return SectionRowView(self, self.index[name])
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, section_data):
+        """Add (or update) the row for a config section.
+
+        :param name:            Storage name of the config section.
+        :param section_data:    Converted config section data (as dict).
+        """
+        row = self.index.get(name, None)
+        if row is None:
+            self.index[name] = len(self.names)
+            self.names.append(name)
+            for param_name, column in self.columns.items():
+                column.append(section_data.get(param_name, _MISSING))
+        else:
+            for param_name, value in section_data.items():
+                self.columns[param_name][row] = value
+
+    def column(self, name, default=None):
+        """Provides the values of a param for all rows (in row order).
+
+        :param name:    Param name.
+        :param default: Value to use for rows without this param.
+        """
+        return [default if value is _MISSING else value
+                for value in self.columns[name]]
+
+    def filter(self, name, predicate):
+        """Select the rows where the param value fulfills the predicate.
+        Rows without this param are skipped.
+
+        :return: List of storage names.
+        """
+        names = self.names
+        return [names[row] for row, value in enumerate(self.columns[name])
+                if value is not _MISSING and predicate(value)]
+
+    def where(self, **conditions):
+        """Select the rows where all params have the expected values.
+
+        :return: List of storage names.
+        """
+        rows = range(len(self.names))
+        for name, expected in conditions.items():
+            column = self.columns[name]
+            rows = [row for row in rows if column[row] == expected]
+        return [self.names[row] for row in rows]
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: SECTION QUERY
+# -----------------------------------------------------------------------------
+def select_indexed_param_names(section_schema):
+    """Provides the names of the indexed params of a config section schema
+    (like: ``Param(type=str, indexed=True)``; collected once per schema).
+    """
+    names = section_schema.__dict__.get("_indexed_param_names", None)
+    if names is None:
+        names = tuple(name for name, param in
+                      select_params_from_section_schema(section_schema)
+                      if getattr(param, "indexed", False))
+        section_schema._indexed_param_names = names
+    return names
+
+
+def _select_index_values(value):
+    """Provides the hashable values to index (one per item, if multiple)."""
+    if value is _MISSING:
+        return ()
+    values = value
+    if not isinstance(value, (list, tuple)):
+        values = [value]
+    indexable = set()
+    for value in values:
+        try:
+            hash(value)
+            indexable.add(value)
+        except TypeError:
+            pass
+    return indexable
+
+
+def _matches_condition(value, expected):
+    if value is _MISSING:
+        return False
+    values = value
+    if not isinstance(value, (list, tuple)):
+        values = [value]
+    if isinstance(expected, (set, frozenset)):
+        return any(value in expected for value in values)
+    return expected in values
+
+
+class SectionQuery(object):
+    """Query layer over the parsed config sections (by config section name).
+    Uses hash indexes for indexed params (``Param(..., indexed=True)``)
+    that are built when the sections are read and updated on each reload.
+    For ``multiple`` params, each item is indexed (condition: contains).
+
+    .. sourcecode::
+
+        query = SectionQuery()
+        storage = ConfigFileProcessor.read_config(query=query)
+        db_hosts = query.find(role="db", region={"eu-1", "eu-2"})
+        ...
+        # -- RELOAD: Only changed sections are re-indexed.
+        storage = ConfigFileProcessor.read_config(query=query)
+    """
+
+    def __init__(self):
+        self.sections = OrderedDict()   # MAPS: section name -> section data
+        self.indexes = {}               # MAPS: param -> {value: set(names)}
+        self.unindexed_sections = {}    # MAPS: param -> set(names) w/o index
+        self._indexed_names = {}        # MAPS: section name -> indexed params
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __contains__(self, section_name):
+        return section_name in self.sections
+
+    def __getitem__(self, section_name):
+        return self.sections[section_name]
+
+    def update_section(self, section_name, section_data, indexed_names=()):
+        """Add or update a config section (and its index entries).
+
+        :return: True, if the section was added or changed.
+        """
+        old_section_data = self.sections.get(section_name, None)
+        if old_section_data is not None:
+            if old_section_data == section_data:
+                self.sections[section_name] = section_data
+                return False
+            self.remove_section(section_name)
+
+        self.sections[section_name] = section_data
+        indexed_names = tuple(indexed_names)
+        self._indexed_names[section_name] = indexed_names
+        for name in indexed_names:
+            index = self.indexes.get(name, None)
+            if index is None:
+                # -- NEW INDEX: Sections (of other schemas) lack it.
+                index = self.indexes[name] = {}
+                self.unindexed_sections[name] = set(
+                    other_name for other_name in self.sections
+                    if name not in self._indexed_names.get(other_name, ()))
+            value = section_data.get(name, _MISSING)
+            for index_value in _select_index_values(value):
+                index.setdefault(index_value, set()).add(section_name)
+        for name, unindexed_sections in self.unindexed_sections.items():
+            if name not in indexed_names:
+                unindexed_sections.add(section_name)
+        return True
+
+    def remove_section(self, section_name):
+        section_data = self.sections.pop(section_name)
+        self._indexed_names.pop(section_name, None)
+        for unindexed_sections in self.unindexed_sections.values():
+            unindexed_sections.discard(section_name)
+        for name, index in self.indexes.items():
+            value = section_data.get(name, _MISSING)
+            for index_value in _select_index_values(value):
+                section_names = index.get(index_value, None)
+                if section_names is not None:
+                    section_names.discard(section_name)
+                    if not section_names:
+                        del index[index_value]
+
+    def retain_sections(self, section_names):
+        """Remove all sections that are not in :param:`section_names`."""
+        section_names = set(section_names)
+        for section_name in list(self.sections):
+            if section_name not in section_names:
+                self.remove_section(section_name)
+
+    def find(self, **conditions):
+        """Find the config sections whose params match all conditions.
+        A condition value is either the expected value (equality) or
+        a set of values (membership). Indexed params are looked up in O(1),
+        other params are checked for the remaining candidates.
+        Sections of schemas where an indexed param is not indexed
+        are checked, too.
+
+        :return: Set of config section names.
+        """
+        candidates = None
+        unindexed_conditions = []
+        for name, expected in conditions.items():
+            index = self.indexes.get(name, None)
+            if index is None:
+                unindexed_conditions.append((name, expected))
+                continue
+            if isinstance(expected, (set, frozenset)):
+                matched = set()
+                for value in expected:
+                    matched.update(index.get(value, ()))
+            else:
+                matched = set(index.get(expected, ()))
+            # -- NOT INDEXED: In sections of other schemas (check them).
+            scanned = self.unindexed_sections[name]
+            if candidates is not None and len(candidates) < len(scanned):
+                scanned = candidates & scanned
+            matched.update(
+                section_name for section_name in scanned
+                if _matches_condition(
+                    self.sections[section_name].get(name, _MISSING), expected))
+
+            if candidates is None:
+                candidates = set(matched)
+            else:
+                candidates &= matched
+            if not candidates:
+                return set()
+
+        if candidates is None:
+            candidates = set(self.sections)
+        for name, expected in unindexed_conditions:
+            candidates = set(
+                section_name for section_name in candidates
+                if _matches_condition(
+                    self.sections[section_name].get(name, _MISSING), expected))
+        return candidates
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: SECTION ROUTER
+# -----------------------------------------------------------------------------
+class SectionRouterNode(object):
+    """Node of the :class:`SectionRouter` trie (for one literal segment)."""
+    __slots__ = ("children", "patterns", "priority")
+
+    def __init__(self):
+        self.children = {}      # MAPS: segment -> node
+        self.patterns = []      # LIST: (remaining pattern, priority)
+        self.priority = None    # Priority of the name that ends here.
+
+
+def has_custom_matches_section(section_schema):
+    """Indicates if a schema class overrides :meth:`SectionSchema.matches_section()`
+    (its matching cannot be represented by its section names).
+    """
+    schema_matches = getattr(section_schema, "matches_section", None)
+    if schema_matches is None:
+        return False
+    return (getattr(schema_matches, "__func__", None) is not
+            SectionSchema.matches_section.__func__)
+
+
+class SectionRouter(object):
+    """Trie over the dot-separated segments of section names/patterns
+    (like: ``svc.*.*.host``) to resolve a section name to its target
+    (normally: its schema) without checking every pattern.
+    If several patterns match, the target that was added first is used
+    (like :meth:`ConfigFileReader.select_config_schema_for()`).
+
+    The literal leading segments of a pattern are stored in the trie.
+    The remaining pattern (from the first segment with wildcards) is matched
+    with :mod:`fnmatch` (same semantics: ``*`` also matches dots,
+    like: ``svc.*.host`` matches ``svc.eu.c1.host``).
+    Schemas with a custom ``matches_section()`` method are checked
+    with this method (in their order).
+
+    .. sourcecode::
+
+        router = SectionRouter([HelloSchema, ServiceHostSchema])
+        assert router.route("svc.eu.c1.host") is ServiceHostSchema
+    """
+
+    def __init__(self, section_schemas=None):
+        self.root = SectionRouterNode()
+        self.targets = []
+        self.custom_matches = []    # LIST: (priority, matches_section)
+        self._priorities = {}       # MAPS: id(target) -> priority
+        for section_schema in section_schemas or []:
+            if has_custom_matches_section(section_schema):
+                priority = self.add_target(section_schema)
+                self.custom_matches.append(
+                    (priority, section_schema.matches_section))
+                continue
+            for section_name in section_schema.section_names:
+                self.add(section_name, section_schema)
+
+    def add_target(self, target):
+        """Provides the priority of a target (adds it, if it is new)."""
+        priority = self._priorities.get(id(target), None)
+        if priority is None:
+            priority = self._priorities[id(target)] = len(self.targets)
+            self.targets.append(target)
+        return priority
+
+    def add(self, pattern, target):
+        """Adds a section name/pattern for a target (like: a schema)."""
+        normcase = os.path.normcase     # -- LIKE: fnmatch()
+        priority = self.add_target(target)
+        node = self.root
+        segments = pattern.split(".")
+        for position, segment in enumerate(segments):
+            if has_wildcards(segment):
+                node.patterns.append((".".join(segments[position:]), priority))
+                return
+            segment = normcase(segment)
+            child = node.children.get(segment, None)
+            if child is None:
+                child = node.children[segment] = SectionRouterNode()
+            node = child
+        if node.priority is None or priority < node.priority:
+            node.priority = priority
+
+    def route(self, section_name):
+        """Resolves a section name to its target.
+
+        :return: Target (like: schema) or None, if no pattern matches.
+        """
+        fnmatch = lazy_import("fnmatch", "fnmatch")
+        normcase = os.path.normcase
+        segments = section_name.split(".")
+        best = None
+        node = self.root
+        position = 0
+        while node is not None:
+            if position == len(segments):
+                if node.priority is not None and (best is None or
+                                                  node.priority < best):
+                    best = node.priority
+                break
+            if node.patterns:
+                rest = ".".join(segments[position:])
+                for pattern, priority in node.patterns:
+                    if ((best is None or priority < best) and
+                            fnmatch(rest, pattern)):
+                        best = priority
+            node = node.children.get(normcase(segments[position]), None)
+            position += 1
+
+        for priority, matches_section in self.custom_matches:
+            if best is not None and priority > best:
+                break
+            if matches_section(section_name):
+                best = priority
+                break
+        if best is None:
+            return None
+        return self.targets[best]
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: VALUE DEDUPLICATION
+# -----------------------------------------------------------------------------
+try:
+    intern_string = sys.intern
+except AttributeError:  # pragma: no cover
+    intern_string = intern  # pylint: disable=undefined-variable; PYTHON2
+
+
+class ValueDeduplicator(object):
+    """Shares equal immutable values (strings, numbers, tuples, ...) in the
+    converted config data and interns keys (param and section names).
+    Optionally, the lists of ``multiple`` params become shared tuples.
+    The saved memory is estimated with :func:`sys.getsizeof()` (shallow).
+    """
+    IMMUTABLE_TYPES = string_types + (bytes, bool, float,
+                                      frozenset) + integer_types
+
+    def __init__(self, share_lists=False):
+        self.share_lists = share_lists
+        self.values = 0
+        self.deduplicated = 0
+        self.bytes_saved = 0
+        self._pool = {}
+
+    def _make_key(self, value):
+        # -- HINT: Type-exact keys (recursive), otherwise equal values of
+        #    other types would be merged: 1 == True == 1.0, -0.0 == 0.0
+        if isinstance(value, float):
+            return (float, value.hex())
+        elif isinstance(value, tuple):
+            return (tuple, tuple(self._make_key(item) for item in value))
+        elif isinstance(value, frozenset):
+            return (frozenset, frozenset(self._make_key(item)
+                                         for item in value))
+        return (type(value), value)
+
+    def _share(self, value):
+        key = self._make_key(value)
+        shared = self._pool.setdefault(key, value)
+        if shared is not value:
+            self.deduplicated += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return shared
+
+    def deduplicate(self, value):
+        """Provides the shared object for a value (if possible)."""
+        self.values += 1
+        if isinstance(value, self.IMMUTABLE_TYPES):
+            return self._share(value)
+        elif isinstance(value, list):
+            items = [self.deduplicate(item) for item in value]
+            if not self.share_lists:
+                value[:] = items
+                return value
+            try:
+                shared = self._share(tuple(items))
+            except TypeError:
+                value[:] = items    # -- UNHASHABLE ITEMS: Keep list.
+                return value
+            self.bytes_saved += sys.getsizeof(value) - sys.getsizeof(shared)
+            return shared
+        return value
+
+    def deduplicate_section(self, section_data):
+        """Provides the section data with interned keys and shared values."""
+        return dict((intern_string(str(name)), self.deduplicate(value))
+                    for name, value in section_data.items())
+
+    def intern_keys(self, storage):
+        """Intern the keys of the storage (like section names), in place."""
+        items = [(intern_string(str(name)), value)
+                 for name, value in storage.items()]
+        storage.clear()
+        storage.update(items)
+        return storage
+
+    def stats(self):
+        return dict(values=self.values, deduplicated=self.deduplicated,
+                    bytes_saved=self.bytes_saved, pool_size=len(self._pool))
+
+
+# -----------------------------------------------------------------------------
+# SUPPORT: MEMORY REPORT
+# -----------------------------------------------------------------------------
+def deep_size(value, seen=None):
+    """Provides the deep size of a value (in bytes) with its contained values
+    (dict, list, tuple, set, slots and instance attributes).
+    Shared objects are counted once. Classes and functions are not counted.
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen or isinstance(value, class_types + (
+            types.FunctionType, types.MethodType, types.ModuleType)):
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += deep_size(key, seen) + deep_size(item, seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += deep_size(item, seen)
+    elif not isinstance(value, string_types):
+        for name in getattr(value.__class__, "__slots__", ()):
+            size += deep_size(getattr(value, name, None), seen)
+        if hasattr(value, "__dict__"):
+            size += deep_size(value.__dict__, seen)
+    return size
+
+
+class _NoMeasurement(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def measure_nothing(phase):     # pylint: disable=unused-argument
+    """Null context manager (if no :class:`MemoryReport` is used)."""
+    return _NoMeasurement()
+
+
+class MemoryReport(object):
+    """Records the memory usage of the :meth:`ConfigFileReader.read_config()`
+    phases (by using :mod:`tracemalloc`) and the deep size of the storage
+    per section. The largest sections and values are flagged.
+    The "allocated" memory of the "parse" phase is kept by the config parser
+    until the "process" phase is finished.
+
+    .. sourcecode::
+
+        class ConfigFileProcessor(ConfigFileReader):
+            memory_report = True
+
+        storage = ConfigFileProcessor.read_config()
+        report = ConfigFileProcessor.stats["memory"]
+        print(format_memory_report(report))
+
+    HINT: The peak is per phase only for Python >= 3.9 (tracemalloc.reset_peak).
+    """
+
+    def __init__(self, top_count=5):
+        import tracemalloc
+        self.top_count = top_count
+        self.phases = OrderedDict()
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+    def measure(self, phase):
+        """Context manager to record the memory usage of a phase."""
+        import contextlib
+        import tracemalloc
+
+        @contextlib.contextmanager
+        def measure_phase():
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            current0, _ = tracemalloc.get_traced_memory()
+            try:
+                yield
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                self.phases[phase] = dict(allocated=current - current0,
+                                          peak=max(0, peak - current0))
+        return measure_phase()
+
+    def stop(self):
+        """Stops tracing (if it was started by this report)."""
+        import tracemalloc
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def finish(self, storage):
+        """Stops tracing and provides the report (as dict) for the storage.
+
+        :param storage: Storage of the config data.
+        :return: Report with: phases, storage, largest_sections, largest_values
+        """
+        self.stop()
+        seen = set()
+        section_sizes = {}
+        values = []
+        for key, value in storage.items():
+            if isinstance(value, dict):
+                items = value.items()
+            elif isinstance(value, SectionRecord):
+                items = value._asdict().items()
+            elif isinstance(value, SectionColumns):
+                items = value.columns.items()
+            elif isinstance(value, SectionRowView):
+                continue    # -- COUNTED: In its SectionColumns.
+            else:
+                # -- PRIMARY SECTION: Merged into the storage.
+                size = deep_size(key, seen) + deep_size(value, seen)
+                section_sizes[""] = section_sizes.get("", 0) + size
+                values.append((key, deep_size(value)))
+                continue
+
+            section_sizes[key] = deep_size(key, seen) + deep_size(value, seen)
+            for name, item in items:
+                values.append(("%s.%s" % (key, name), deep_size(item)))
+
+        def largest(items):
+            items = sorted(items, key=lambda item: item[1], reverse=True)
+            return [dict(name=name, size=size)
+                    for name, size in items[:self.top_count]]
+
+        return dict(phases=dict(self.phases),
+                    storage=dict(total=deep_size(storage),
+                                 sections=section_sizes),
+                    largest_sections=largest(section_sizes.items()),
+                    largest_values=largest(values))
+
+
+def format_memory_report(report):
+    """Provides the human-readable summary of a :class:`MemoryReport`.
+
+    :param report:  Memory report (as dict).
+    :return: Summary text (as string).
+    """
+    def format_size(size):
+        for unit in ("B", "KiB", "MiB"):
+            if abs(size) < 1024 or unit == "MiB":
+                break
+            size /= 1024.0
+        if unit == "B":
+            return "%d %s" % (size, unit)
+        return "%.1f %s" % (size, unit)
+
+    lines = ["MEMORY PHASES:"]
+    for phase, entry in report["phases"].items():
+        lines.append("  %-10s allocated=%-10s peak=%s" % (
+            phase, format_size(entry["allocated"]), format_size(entry["peak"])))
+    lines.append("STORAGE: %s" % format_size(report["storage"]["total"]))
+    lines.append("LARGEST SECTIONS:")
+    for entry in report["largest_sections"]:
+        lines.append("  %-30s %s" % (entry["name"] or "(primary section)",
+                                     format_size(entry["size"])))
+    lines.append("LARGEST VALUES:")
+    for entry in report["largest_values"]:
+        lines.append("  %-30s %s" % (entry["name"], format_size(entry["size"])))
+    return "\n".join(lines)
+
+
 # -----------------------------------------------------------------------------
 # SUPPORT: READ CONFIGFILE
 # -----------------------------------------------------------------------------
-def generate_configfile_names(config_files, config_searchpath=None):
+def directory_mtime(directory):
+    """Provides the mtime of a directory (or None, if it is missing)."""
+    try:
+        stat = os.stat(directory or ".")
+        return getattr(stat, "st_mtime_ns", stat.st_mtime)
+    except OSError:
+        return None
+
+
+class AncestorSearchpath(object):
+    """Searchpath item that looks for config files in the start directory
+    and all its parent directories (like git does to discover its repository).
+    Nearer directories are preferred and override the files of parent
+    directories. Directory lookups are memoized, so repeated searches
+    in (nested) directories of the same project reuse earlier lookups.
+    Memoized directory entries are revalidated by the directory mtime
+    (new config files are found, changed markers apply on the next search).
+
+    The upward walk stops at the filesystem root or at a boundary:
+
+    * a directory that contains one of the ``markers`` (included),
+    * the HOME directory, if ``stop_at_home`` is true (included),
+    * a parent directory on another device, if ``same_device`` is true.
+
+    .. sourcecode::
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_searchpath = [AncestorSearchpath(markers=[".git"])]
+    """
+
+    def __init__(self, start=".", markers=None, stop_at_home=False,
+                 same_device=True):
+        self.start = start
+        self.markers = list(markers or [])
+        self.stop_at_home = stop_at_home
+        self.same_device = same_device
+        self._directory_entries = {}    # MAPS: directory -> (mtime, names)
+        self._directory_devices = {}    # MAPS: directory -> st_dev
+        self._ancestors = {}            # MAPS: directory -> [directories]
+
+    def clear_cache(self):
+        self._directory_entries.clear()
+        self._directory_devices.clear()
+        self._ancestors.clear()
+
+    def _entries_of(self, directory):
+        mtime = directory_mtime(directory)
+        cached = self._directory_entries.get(directory, None)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            entries = frozenset(os.listdir(directory))
+        except OSError:
+            entries = frozenset()
+        if cached is not None and self.markers and \
+                cached[1].intersection(self.markers) != \
+                entries.intersection(self.markers):
+            # -- BOUNDARY CHANGED: Memoized walks are no longer valid.
+            self._ancestors.clear()
+        self._directory_entries[directory] = (mtime, entries)
+        return entries
+
+    def _device_of(self, directory):
+        device = self._directory_devices.get(directory, None)
+        if device is None:
+            try:
+                device = os.stat(directory).st_dev
+            except OSError:
+                device = -1
+            self._directory_devices[directory] = device
+        return device
+
+    def _is_boundary(self, directory, home):
+        if directory == home:
+            return True
+        entries = self._entries_of(directory)
+        return any(marker in entries for marker in self.markers)
+
+    def directories(self, start=None):
+        """Provides the directories to search (nearest directory first).
+
+        :param start:   Start directory (default: self.start).
+        :return: List of directories (as absolute paths).
+        """
+        if start is None:
+            start = self.start
+        start = os.path.abspath(os.path.expanduser(start))
+        home = None
+        if self.stop_at_home:
+            home = os.path.abspath(os.path.expanduser("~"))
+
+        directories = []
+        directory = start
+        while True:
+            known_ancestors = self._ancestors.get(directory, None)
+            if known_ancestors is not None:
+                # -- REUSE: Earlier walk from a nested directory.
+                directories.extend(known_ancestors)
+                break
+
+            directories.append(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory or self._is_boundary(directory, home):
+                break
+            elif (self.same_device and
+                  self._device_of(parent) != self._device_of(directory)):
+                break
+            directory = parent
+
+        # -- MEMOIZE: Walk result for each visited directory.
+        for index, directory in enumerate(directories):
+            if directory in self._ancestors:
+                break
+            self._ancestors[directory] = directories[index:]
+        return directories
+
+    def generate_configfile_names(self, config_files):
+        """Generates the existing config files in the searched directories
+        (farthest directory and last basename first).
+
+        :param config_files:    List of config file basenames.
+        :return: Available configuration file names (as generator).
+        """
+        for directory in reversed(self.directories()):
+            entries = self._entries_of(directory)
+            for config_basename in reversed(config_files):
+                if config_basename not in entries:
+                    continue
+                config_fname = os.path.join(directory, config_basename)
+                if os.path.isfile(config_fname):
+                    yield config_fname
+
+
+class MissingFileCache(object):
+    """Negative lookup cache for missing config file candidates.
+    Missing files are remembered per directory. A cached entry is trusted
+    for ``ttl`` seconds. Afterwards, it is revalidated by the mtime of its
+    directory: If the directory is unchanged, its missing files are still
+    missing (without checking them again).
+
+    .. sourcecode::
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini", "hello.cfg"]
+            config_searchpath = [".", "~/.config"]
+            missing_file_cache = MissingFileCache(ttl=10)
+    """
+    DEFAULT_TTL = 5.0   # SECONDS
+
+    def __init__(self, ttl=None):
+        if ttl is None:
+            ttl = self.DEFAULT_TTL
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # -- MAPS: abspath(directory) -> [directory_mtime, checked_time,
+        #                                 missing_names]
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _split(filename):
+        directory, basename = os.path.split(filename)
+        return (os.path.abspath(directory or "."), basename)
+
+    def directory_mtime_of(self, filename):
+        """Provides the mtime of the directory of a file. Use it before
+        the file is checked (for :meth:`add_missing()`).
+        """
+        return directory_mtime(self._split(filename)[0])
+
+    def is_missing(self, filename):
+        """Indicates if a file is known to be missing (cached lookup)."""
+        directory, basename = self._split(filename)
+        entry = self._entries.get(directory, None)
+        if entry is None or basename not in entry[2]:
+            self.misses += 1
+            return False
+
+        now = time.time()
+        if now - entry[1] > self.ttl:
+            # -- REVALIDATE: By using the directory mtime.
+            if directory_mtime(directory) != entry[0]:
+                with self._lock:
+                    self._entries.pop(directory, None)
+                self.misses += 1
+                return False
+            entry[1] = now
+        self.hits += 1
+        return True
+
+    def add_missing(self, filename, mtime=None):
+        """Remember that a file is missing.
+
+        :param filename:    File that is missing.
+        :param mtime:   Directory mtime before the file was checked
+            (see: :meth:`directory_mtime_of()`). Files that are created
+            after this check are detected by the directory mtime.
+        """
+        directory, basename = self._split(filename)
+        if mtime is None:
+            mtime = directory_mtime(directory)
+        with self._lock:
+            entry = self._entries.get(directory, None)
+            if entry is None or entry[0] != mtime:
+                entry = [mtime, time.time(), set()]
+                self._entries[directory] = entry
+            entry[2].add(basename)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, filename):
+        """Persist the cache (as JSON file), like a parse cache."""
+        import json
+        data = dict((directory, [entry[0], sorted(entry[2])])
+                    for directory, entry in self._entries.items())
+        with open(filename, "w") as cache_file:
+            json.dump(data, cache_file)
+
+    def load(self, filename):
+        """Load a persisted cache. Loaded entries are revalidated on first use
+        (by their directory mtime).
+
+        :return: True, if the cache file was loaded.
+        """
+        import json
+        try:
+            with open(filename) as cache_file:
+                data = json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return False
+        with self._lock:
+            for directory, (directory_mtime, missing_names) in data.items():
+                self._entries[directory] = [directory_mtime, 0,
+                                            set(missing_names)]
+        return True
+
+
+def generate_configfile_names(config_files, config_searchpath=None,
+                              missing_cache=None):
     """Generates all configuration file name combinations to read.
 
     .. sourcecode::
@@ -291,20 +1926,37 @@ def generate_configfile_names(config_files, config_searchpath=None):
                     yield config_fname
 
     :param config_files:        List of config file basenames.
-    :param config_searchpath:   List of directories to look for config files.
+    :param config_searchpath:   List of directories to look for config files
+                                (or :class:`AncestorSearchpath` items).
+    :param missing_cache:       Optional :class:`MissingFileCache` to use.
     :return: List of available configuration file names (as generator)
     """
     if config_searchpath is None:
         config_searchpath = ["."]
 
     for config_path in reversed(config_searchpath):
+        if isinstance(config_path, AncestorSearchpath):
+            # -- UPWARD SEARCH: In config_path.start and its parent directories.
+            for config_fname in config_path.generate_configfile_names(
+                    config_files):
+                yield config_fname
+            continue
+
         for config_basename in reversed(config_files):
             config_fname = os.path.join(config_path, config_basename)
             config_fname = os.path.expanduser(config_fname)
             config_fname = os.path.expanduser(config_fname)
+            mtime = None
+            if missing_cache is not None:
+                if missing_cache.is_missing(config_fname):
+                    continue
+                # -- BEFORE CHECK: Detects files that are created meanwhile.
+                mtime = missing_cache.directory_mtime_of(config_fname)
             if os.path.isfile(config_fname):
                 # MAYBE: yield os.path.normpath(config_fname)
                 yield config_fname
+            elif missing_cache is not None:
+                missing_cache.add_missing(config_fname, mtime)
 
 
 def select_config_sections(configfile_sections, desired_section_patterns):
@@ -316,15 +1968,275 @@ def select_config_sections(configfile_sections, desired_section_patterns):
     :param desired_section_patterns:
     :return: List of selected section names or empty list (as generator).
     """
+    fnmatch = lazy_import("fnmatch", "fnmatch")
     for section_name in configfile_sections:
         for desired_section_pattern in desired_section_patterns:
             if fnmatch(section_name, desired_section_pattern):
                 yield section_name
 
 
+def generate_config_fragment_names(fragment_dirs, config_searchpath=None,
+                                   pattern="*.ini"):
+    """Generates the config fragment files in drop-in directories
+    (like: ``hello.d/*.ini``). Fragments of one directory are provided in
+    lexical order (later fragments override earlier ones).
+    Directories are searched like :func:`generate_configfile_names()`.
+
+    :param fragment_dirs:       List of fragment directory names (basenames).
+    :param config_searchpath:   List of directories to look for fragment dirs.
+    :param pattern:             Glob filter for fragment files.
+    :return: List of available fragment file names (as generator)
+    """
+    from fnmatch import fnmatch
+    if config_searchpath is None:
+        config_searchpath = ["."]
+
+    for config_path in reversed(config_searchpath):
+        config_paths = [config_path]
+        if isinstance(config_path, AncestorSearchpath):
+            config_paths = reversed(config_path.directories())
+
+        for config_path2 in config_paths:
+            for fragment_dir in reversed(fragment_dirs):
+                dirname = os.path.join(config_path2, fragment_dir)
+                dirname = os.path.expanduser(dirname)
+                if not os.path.isdir(dirname):
+                    continue
+                for basename in sorted(os.listdir(dirname)):
+                    fragment_fname = os.path.join(dirname, basename)
+                    if (fnmatch(basename, pattern) and
+                            os.path.isfile(fragment_fname)):
+                        yield fragment_fname
+
+
+def make_raw_config_parser():
+    """Creates a config parser that provides the raw data of a config file."""
+    import configparser
+    # -- HINT: Unused default_section keeps the DEFAULT section as normal one.
+    parser = configparser.RawConfigParser(default_section="\0__NONE__")
+    parser.optionxform = str
+    return parser
+
+
+def select_config_data(parser):
+    """Provides the raw data of a :func:`make_raw_config_parser()` parser."""
+    data = OrderedDict()
+    for section_name in parser.sections():
+        data[section_name] = OrderedDict(parser.items(section_name))
+    return data
+
+
+def read_config_data(filename, encoding=None):
+    """Parse a config file into its raw data (without interpolation).
+
+    :param filename:    Config file to parse.
+    :param encoding:    Optional encoding of the config file.
+    :return: Raw data as ``{section_name: {name: text}}`` (as dict).
+    """
+    parser = make_raw_config_parser()
+    parser.read(filename, encoding=encoding)
+    return select_config_data(parser)
+
+
+def read_config_data_with_includes(filename, encoding=None):
+    """Parse a config file with include directives into its raw data.
+    Included files are described by ``%include`` lines and/or
+    by the values of the ``[include]`` section.
+    Relative paths are relative to the directory of the including file.
+
+    .. sourcecode:: ini
+
+        # -- FILE: hello.ini
+        %include common.ini
+        [include]
+        files = more/common2.ini ~/.hello_common.ini
+
+        [hello]
+        ...
+
+    :param filename:    Config file to parse.
+    :param encoding:    Optional encoding of the config file.
+    :return: Tuple of (included file names, raw data).
+    """
+    include_marker = "%include"
+    includes = []
+    lines = []
+    with io.open(filename, encoding=encoding) as config_file:
+        for line in config_file:
+            if line.lstrip().startswith(include_marker):
+                includes.extend(line.lstrip()[len(include_marker):].split())
+                line = "#\n"   # -- KEEP: Line numbers for parse errors.
+            lines.append(line)
+
+    parser = make_raw_config_parser()
+    parser.read_string(u"".join(lines), source=filename)
+    data = select_config_data(parser)
+    include_section = data.pop("include", None)
+    if include_section:
+        for text in include_section.values():
+            includes.extend(text.split())
+
+    directory = os.path.dirname(filename)
+    includes = [os.path.join(directory, os.path.expanduser(name))
+                for name in includes]
+    return (includes, data)
+
+
+def merge_config_data(parser, data):
+    """Merge raw config data into a config parser (later data overrides).
+    Values are stored raw (interpolation is applied when they are used,
+    like for config files that are read by the parser).
+
+    :param parser:  Config parser to use (as outgoing param).
+    :param data:    Raw data as ``{section_name: {name: text}}`` (as dict).
+    """
+    # pylint: disable=protected-access
+    # -- HINT: Stored like parser.read() does (without set()), because set()
+    #    validates the interpolation syntax of each value (even if unused).
+    for section_name, values in data.items():
+        if section_name == parser.default_section:
+            section = parser._defaults
+        else:
+            if not parser.has_section(section_name):
+                parser.add_section(section_name)
+            section = parser._sections[section_name]
+        for name, value in values.items():
+            section[parser.optionxform(name)] = value
+
+
+def file_fingerprint(filename):
+    """Provides a fingerprint to detect if a file was changed."""
+    stat = os.stat(filename)
+    mtime = getattr(stat, "st_mtime_ns", stat.st_mtime)
+    return (mtime, stat.st_size, stat.st_ino, stat.st_dev)
+
+
+class ParsedFileCache(object):
+    """Bounded LRU cache of parsed config files keyed by realpath.
+    A cached entry is reused only while the file fingerprint is unchanged.
+    Entries of files that disappeared are dropped when the file is read
+    again, by :meth:`prune()` or (as least recently used) on overflow.
+
+    :param read_data:   Parse function to use (default: read_config_data).
+    :param maxsize:     Max. number of cached files.
+    """
+    DEFAULT_MAXSIZE = 256
+
+    def __init__(self, read_data=None, maxsize=None):
+        if maxsize is None:
+            maxsize = self.DEFAULT_MAXSIZE
+        self.read_data = read_data or read_config_data
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # MAPS: realpath -> (fingerprint, data)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def read(self, filename, encoding=None):
+        """Provides the raw data of a config file (parsed once per change).
+
+        :param filename:    Config file to read.
+        :return: Raw data as ``{section_name: {name: text}}`` (as dict).
+        """
+        realpath = os.path.realpath(filename)
+        try:
+            fingerprint = file_fingerprint(realpath)
+        except OSError:
+            # -- FILE DISAPPEARED: Drop its cached data.
+            with self._lock:
+                self._data.pop(realpath, None)
+            raise
+        with self._lock:
+            cached = self._data.get(realpath, None)
+            if cached is not None and cached[0] == fingerprint:
+                # -- LRU: Mark as most recently used.
+                self._data[realpath] = self._data.pop(realpath)
+                self.hits += 1
+                return cached[1]
+
+        data = self.read_data(realpath, encoding=encoding)
+        with self._lock:
+            self.misses += 1
+            self._data.pop(realpath, None)
+            self._data[realpath] = (fingerprint, data)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return data
+
+    def prune(self):
+        """Drop the entries of config files that no longer exist.
+
+        :return: Number of dropped entries.
+        """
+        with self._lock:
+            missing = [realpath for realpath in self._data
+                       if not os.path.exists(realpath)]
+            for realpath in missing:
+                del self._data[realpath]
+        return len(missing)
+
+    def filenames(self):
+        """Provides the realpaths of the cached config files."""
+        return list(self._data.keys())
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def decode_config_sources(sources, encoding=None):
+    """Decodes in-memory config sources (once) into their config text.
+
+    :param sources:     List of texts, bytes-like objects, file objects or
+                        ``(name, source)`` pairs.
+    :param encoding:    Encoding of bytes-like objects (default: UTF-8).
+    :return: Pairs of ``(name, text)`` (as generator).
+    """
+    import codecs
+    encoding = encoding or "UTF-8"
+    for index, source in enumerate(sources):
+        name = "<source-%d>" % index
+        if isinstance(source, tuple) and len(source) == 2:
+            name, source = source
+        elif hasattr(source, "read"):
+            name = getattr(source, "name", name)
+
+        if hasattr(source, "read"):
+            source = source.read()
+        if not isinstance(source, string_types):
+            # -- BYTES-LIKE (buffer protocol): Decoded without extra copy.
+            source = codecs.decode(source, encoding)
+        yield (name, source)
+
+
+def has_wildcards(section_name):
+    """Indicates if a section name is a pattern (with :mod:`fnmatch` wildcards).
+    """
+    return any(char in section_name for char in "*?[")
+
+
+def make_env_name(name):
+    """Converts a section/param name into its environment variable part.
+
+    .. sourcecode::
+
+        assert make_env_name("hello.more-alice") == "HELLO_MORE_ALICE"
+    """
+    import re
+    return re.sub(r"[^A-Z0-9]", "_", name.upper())
+
+
 # -----------------------------------------------------------------------------
 # BOILER-PLATE FOR CONFIG-FILE READER
 # -----------------------------------------------------------------------------
+_root_readers_lock = threading.Lock()
+
+
 class ConfigFileReader(object):
     """Generic configuration file reader.
     Concrete configuration file reader class must extend it and specify the
@@ -380,29 +2292,532 @@ class ConfigFileReader(object):
     config_section_schemas = []     # Config section schema description.
     config_sections = []            # OPTIONAL: Config sections of interest.
     config_searchpath = ["."]       # OPTIONAL: Where to look for config files.
+    missing_file_cache = None       # OPTIONAL: MissingFileCache to use.
+    batch_path_validation = False   # OPTIONAL: Validate path params together.
+    batch_path_validation_workers = None    # OPTIONAL: Thread pool size.
+    lazy_files = False              # OPTIONAL: Open click.File on first use.
+    config_fragment_dirs = []       # OPTIONAL: Drop-in dirs, like: "hello.d"
+    config_fragment_pattern = "*.ini"       # OPTIONAL: Fragment file filter.
+    config_fragment_workers = None          # OPTIONAL: Thread pool size.
+    parsed_file_cache = ParsedFileCache()   # SHARED: Parsed config files.
+    fragment_cache = parsed_file_cache      # SHARED: Parsed fragments.
+    share_parsed_files = False      # OPTIONAL: Use parsed_file_cache.
+    cache_storage = False           # OPTIONAL: Reuse storage of unchanged files.
+    root_reader_cache_size = 128    # OPTIONAL: Max. cached for_root() readers.
+    config_includes = False         # OPTIONAL: Use "%include", [include].
+    config_include_max_depth = 10   # OPTIONAL: Max. nesting of config files.
+    config_env_prefix = None        # OPTIONAL: Env overlay prefix, like "HELLO"
+    section_records = False         # OPTIONAL: Store sections as SectionRecord.
+    section_columns = False         # OPTIONAL: Wildcard schemas as columns.
+    deduplicate_values = False      # OPTIONAL: Share equal values, intern keys.
+    deduplicate_lists = False       # OPTIONAL: Multiple values as shared tuples.
+    stats = None                    # Statistics of the last read_config() call.
+    config_interpolation = True     # OPTIONAL: Use "%(name)s" interpolation.
+    bulk_section_values = False     # OPTIONAL: Use BulkConfigSection.
+    profile_conversions = False     # OPTIONAL: Use ConversionProfiler.
+    memory_report = False           # OPTIONAL: Use MemoryReport (see: stats).
+    section_router = False          # OPTIONAL: Use SectionRouter (trie).
+    nested_storage = False          # OPTIONAL: Dict storage nested by segment.
+    config_server_socket = None     # OPTIONAL: Config server socket to use.
+    config_server_timeout = 0.05    # OPTIONAL: Config server timeout (in sec).
 
     # -- GENERIC PART:
     # Uses declarative specification from above (config_files, config_sections, ...)
     @classmethod
-    def read_config(cls):
-        configfile_names = list(
-            generate_configfile_names(cls.config_files, cls.config_searchpath))
-        parser = configparser.ConfigParser()
+    def read_config(cls, sections=None, keys=None, query=None):
+        """Read the configuration files and provide the converted data.
+
+        PROJECTION: Restrict what is processed if only a small part of the
+        configuration data is needed (for example by a sub-command).
+
+        .. sourcecode::
+
+            # -- ONLY: Section "hello" and param "name" (in any schema).
+            storage = ConfigFileProcessor.read_config(sections=["hello"],
+                                                      keys=["name"])
+
+        :param sections:    Optional section names/patterns of interest.
+        :param keys:        Optional param names of interest.
+        :param query:       Optional :class:`SectionQuery` to update.
+        :return: Storage with converted config data (as dict).
+        """
+        if cls.config_server_socket and sections is None and keys is None \
+                and query is None:
+            storage = cls.read_config_from_server()
+            if storage is not None:
+                return storage
+
+        if not cls.memory_report:
+            return cls.read_config_phases(measure_nothing, sections=sections,
+                                          keys=keys, query=query)
+
+        memory_report = MemoryReport()
+        try:
+            storage = cls.read_config_phases(memory_report.measure,
+                                             sections=sections, keys=keys,
+                                             query=query)
+            cls.stats["memory"] = memory_report.finish(storage)
+        finally:
+            # -- ALSO ON ERRORS: Keep tracemalloc off for the process.
+            memory_report.stop()
+        return storage
+
+    @classmethod
+    def read_config_phases(cls, measure, sections=None, keys=None,
+                           query=None):
+        """Read the configuration files in phases (discover, parse, process).
+        Used by :meth:`read_config()`.
+
+        :param measure: Context manager to measure a phase (by name).
+        :return: Storage with converted config data (as dict).
+        """
+        with measure("discover"):
+            configfile_names = list(
+                generate_configfile_names(cls.config_files,
+                                          cls.config_searchpath,
+                                          cls.missing_file_cache))
+        use_cache = cls.cache_storage and sections is None and keys is None \
+            and query is None
+        cached = cls.__dict__.get("_cached_storage", None)
+        if use_cache and cached is not None:
+            # -- STAT REVALIDATION: Reuse storage if config files are unchanged.
+            cache_key, included_filenames, storage = cached
+            if cache_key == cls.make_storage_cache_key(configfile_names,
+                                                       included_filenames):
+                return storage
+
+        included_filenames = ()
+        with measure("parse"):
+            parser = cls.make_config_parser()
+            if cls.config_includes:
+                included_filenames = cls.read_configfiles_with_includes(
+                    parser, configfile_names)
+            elif cls.share_parsed_files:
+                cls.read_configfiles_shared(parser, configfile_names)
+            else:
+                parser.read(configfile_names)
+            if cls.config_fragment_dirs:
+                cls.read_config_fragments(parser)
+        with measure("process"):
+            storage = cls.process_config_parser(parser, sections=sections,
+                                                keys=keys, query=query)
+        if use_cache:
+            cache_key = cls.make_storage_cache_key(configfile_names,
+                                                   included_filenames)
+            cls._cached_storage = (cache_key, included_filenames, storage)
+        return storage
+
+    @classmethod
+    def make_storage_cache_key(cls, configfile_names, included_filenames=()):
+        """Provides the key to detect if the storage must be read again
+        (for: cache_storage). Covers the fingerprints of the config files,
+        their included files and fragments and the env overlay variables.
+        """
+        configfile_names = list(configfile_names) + list(included_filenames)
+        return (cls.make_configfiles_fingerprint(configfile_names),
+                cls.select_env_overlay_items())
+
+    @classmethod
+    def select_env_overlay_items(cls, environ=None):
+        """Provides the environment variables for the env overlay
+        (sorted, as tuple of name-value pairs).
+        """
+        if not cls.config_env_prefix:
+            return ()
+        if environ is None:
+            environ = os.environ
+        prefix = make_env_name(cls.config_env_prefix) + "_"
+        return tuple(sorted((env_name, text)
+                            for env_name, text in environ.items()
+                            if env_name.upper().startswith(prefix)))
+
+    @classmethod
+    def make_configfiles_fingerprint(cls, configfile_names):
+        """Provides the fingerprint of the config files (and fragments) to
+        detect if they were changed, added or removed.
+        HINT: Pass included files as part of the config files.
+        """
+        filenames = list(configfile_names)
+        if cls.config_fragment_dirs:
+            filenames.extend(generate_config_fragment_names(
+                cls.config_fragment_dirs, cls.config_searchpath,
+                cls.config_fragment_pattern))
+        return tuple((filename, file_fingerprint(filename))
+                     for filename in filenames)
+
+    @classmethod
+    def for_root(cls, root):
+        """Provides the reader for another config root directory
+        (like: the config directory of a tenant). The relative directories
+        of :attr:`config_searchpath` are used below this root directory.
+        The reader classes share the schemas (and what is derived from them)
+        and are kept in a bounded LRU cache (root_reader_cache_size).
+        Each one reuses its storage while its config files are unchanged
+        (treat the storage as read-only).
+
+        .. sourcecode::
+
+            storage = ConfigFileProcessor.for_root(tenant_dir).read_config()
+
+        :param root:    Config root directory.
+        :return: Reader class for this root directory.
+        """
+        root = os.path.abspath(os.path.expanduser(root))
+        with _root_readers_lock:
+            root_readers = cls.__dict__.get("_root_readers", None)
+            if root_readers is None:
+                root_readers = cls._root_readers = OrderedDict()
+            reader_class = root_readers.pop(root, None)
+            if reader_class is None:
+                reader_class = cls.make_root_reader_class(root)
+            root_readers[root] = reader_class
+            while len(root_readers) > cls.root_reader_cache_size:
+                root_readers.popitem(last=False)
+        return reader_class
+
+    @classmethod
+    def make_root_reader_class(cls, root):
+        """Creates the reader class for a config root directory."""
+        if not cls.config_sections:
+            # -- AUTO-DISCOVER (once): Shared with the root reader classes.
+            cls.config_sections = cls.collect_config_sections_from_schemas()
+
+        config_searchpath = []
+        for config_path in cls.config_searchpath:
+            if isinstance(config_path, string_types) and \
+                    not config_path.startswith("~"):
+                config_path = os.path.normpath(os.path.join(root, config_path))
+            elif isinstance(config_path, AncestorSearchpath):
+                start = os.path.expanduser(config_path.start)
+                config_path = AncestorSearchpath(
+                    os.path.normpath(os.path.join(root, start)),
+                    config_path.markers, config_path.stop_at_home,
+                    config_path.same_device)
+            config_searchpath.append(config_path)
+
+        namespace = dict(config_root=root, config_searchpath=config_searchpath,
+                         cache_storage=True, config_server_socket=None)
+        if cls.config_env_prefix:
+            namespace["_env_index"] = cls.compile_env_index()
+        class_name = "%sForRoot" % cls.__name__
+        return type(class_name, (cls,), namespace)
+
+    @classmethod
+    def read_config_from_server(cls):
+        """Try to get the storage from the config server
+        (see: ``python -m click_configfile serve``) for the current directory.
+
+        :return: Storage (as dict) or None, if the config server is not
+            available (not running, too slow, reader not registered, ...).
+        """
+        if cls.select_env_overlay_items():
+            # -- ENV OVERLAY: Environment of this process is needed.
+            return None
+        try:
+            return request_config_from_server(cls.config_server_socket,
+                                              get_reader_name(cls),
+                                              os.getcwd(),
+                                              cls.config_server_timeout)
+        except Exception:   # pylint: disable=broad-except
+            # -- FALLBACK: Read the config files in this process.
+            return None
+
+    @classmethod
+    def read_config_from(cls, sources, sections=None, keys=None, query=None,
+                         encoding=None):
+        """Read the configuration from in-memory sources (instead of files).
+        Like :attr:`config_files`, the first source is preferred and
+        overrides the other ones.
+
+        Supported sources are: text (as string), bytes-like objects
+        (bytes, bytearray, memoryview), file objects and
+        ``(name, source)`` pairs (the name is used in parse errors).
+
+        .. sourcecode::
+
+            storage = ConfigFileProcessor.read_config_from([
+                ("override.ini", memoryview(override_blob)),
+                base_config_text,
+            ])
+
+        :param sources:     List of config sources (in priority order).
+        :param encoding:    Encoding of bytes sources (default: UTF-8).
+        :return: Storage with converted config data (as dict).
+        """
+        parser = cls.make_config_parser()
+        named_texts = list(decode_config_sources(sources, encoding))
+        for name, text in reversed(named_texts):
+            parser.read_string(text, source=name)
+        return cls.process_config_parser(parser, sections=sections,
+                                         keys=keys, query=query)
+
+    @classmethod
+    def make_config_parser(cls):
+        """Creates the config parser that is used to read the config files."""
+        import configparser     # -- USE BACKPORT FOR: Python2
+        if cls.config_interpolation:
+            parser = configparser.ConfigParser()
+        else:
+            parser = configparser.ConfigParser(interpolation=None)
         parser.optionxform = str
-        parser.read(configfile_names)
+        return parser
+
+    @classmethod
+    def select_config_section(cls, parser, section_name,
+                              interpolation_memo=None):
+        """Provides the config section to parse (by name).
+
+        :param parser:          Config parser to use.
+        :param section_name:    Config section name.
+        :param interpolation_memo:  Interpolated values of this parser
+                                    (used with: bulk_section_values).
+        :return: Config section (SectionProxy or BulkConfigSection).
+        """
+        if cls.bulk_section_values:
+            return BulkConfigSection(parser, section_name,
+                                     interpolation_memo=interpolation_memo,
+                                     interpolation=cls.config_interpolation)
+        return parser[section_name]
+
+    @classmethod
+    def process_config_parser(cls, parser, sections=None, keys=None,
+                              query=None):
+        """Select, parse and convert the config sections of a config parser
+        (with the config file contents).
+
+        :param parser:      Config parser to use.
+        :param sections:    Optional section names/patterns of interest.
+        :param keys:        Optional param names of interest.
+        :param query:       Optional :class:`SectionQuery` to update.
+        :return: Storage with converted config data (as dict).
+        """
+        if cls.nested_storage and (cls.section_records or cls.section_columns):
+            raise ValueError("nested_storage: Not supported with "
+                             "section_records or section_columns")
+        if cls.config_env_prefix:
+            cls.apply_env_overlay(parser)
 
         if not cls.config_sections:
             # -- AUTO-DISCOVER (once): From cls.config_section_schemas
             cls.config_sections = cls.collect_config_sections_from_schemas()
 
+        if cls.section_router:
+            selector = cls.compile_section_router("_section_selector",
+                                                  cls.config_sections)
+            section_names = [section_name
+                             for section_name in parser.sections()
+                             if selector.route(section_name) is not None]
+        else:
+            section_names = select_config_sections(parser.sections(),
+                                                   cls.config_sections)
+        if sections is not None:
+            section_names = select_config_sections(section_names, sections)
+        section_names = list(section_names)
+        interpolation_memo = {}
+        config_sections = [cls.select_config_section(parser, section_name,
+                                                     interpolation_memo)
+                           for section_name in section_names]
+
+        # -- OPTIONAL PARTS: Passed only if used (keeps derived classes working).
+        options = {}
+        if keys is not None:
+            options["keys"] = keys
+        if query is not None:
+            options["query"] = query
+        profiler = None
+        if cls.profile_conversions:
+            profiler = ConversionProfiler()
+            options["profiler"] = profiler
+        deduplicator = None
+        if cls.deduplicate_values:
+            deduplicator = ValueDeduplicator(cls.deduplicate_lists)
+            options["deduplicator"] = deduplicator
+        if cls.batch_path_validation:
+            options["batch"] = cls.validate_paths_in_batch(config_sections,
+                                                           keys)
+
         storage = {}
-        for section_name in select_config_sections(parser.sections(),
-                                                   cls.config_sections):
-            # print("PROCESS-SECTION: %s" % section_name)
-            config_section = parser[section_name]
-            cls.process_config_section(config_section, storage)
+        for config_section in config_sections:
+            # print("PROCESS-SECTION: %s" % config_section.name)
+            cls.process_config_section(config_section, storage, **options)
+        if query is not None:
+            query.retain_sections(section_names)
+        stats = {}
+        if deduplicator is not None:
+            deduplicator.intern_keys(storage)
+            stats["dedup"] = deduplicator.stats()
+        if profiler is not None:
+            stats["conversions"] = profiler.report()
+        cls.stats = stats
         return storage
 
+    @classmethod
+    def read_configfiles_shared(cls, parser, configfile_names):
+        """Read the config files by using the :attr:`parsed_file_cache`
+        (shared by all reader classes). Each file is parsed only once per
+        process (until it is changed). Each reader applies only its own
+        section selection and schemas on the shared data.
+
+        :param parser:  Config parser to use (as outgoing param).
+        :param configfile_names:    Config files to read.
+        """
+        for filename in configfile_names:
+            merge_config_data(parser, cls.parsed_file_cache.read(filename))
+
+    @classmethod
+    def read_configfiles_with_includes(cls, parser, configfile_names):
+        """Read the config files and the files they include.
+        Each file is parsed only once (even if it is included many times).
+        Included files are merged before the contents of the including file.
+
+        :param parser:  Config parser to use (as outgoing param).
+        :param configfile_names:    Config files to read.
+        :return: Realpaths of all files that were read (with included files).
+        :raises: ValueError, if an include cycle or too deep nesting occurs
+            or if an included file is missing.
+        """
+        # -- UNBOUNDED: Provides all included files (per read).
+        include_cache = ParsedFileCache(read_config_data_with_includes,
+                                        maxsize=sys.maxsize)
+        for filename in configfile_names:
+            cls.read_configfile_with_includes(parser, filename, include_cache)
+        return include_cache.filenames()
+
+    @classmethod
+    def read_configfile_with_includes(cls, parser, filename, include_cache,
+                                      include_stack=None):
+        if include_stack is None:
+            include_stack = []
+        realpath = os.path.realpath(filename)
+        if realpath in include_stack:
+            message = "Include cycle: %s"
+            raise ValueError(message % " -> ".join(include_stack + [realpath]))
+        elif len(include_stack) >= cls.config_include_max_depth:
+            message = "Include depth exceeded (max: %d): %s"
+            raise ValueError(message % (cls.config_include_max_depth, realpath))
+        elif include_stack and not os.path.isfile(realpath):
+            message = "Include file not found: %s (included by: %s)"
+            raise ValueError(message % (filename, include_stack[-1]))
+
+        includes, data = include_cache.read(realpath)
+        include_stack.append(realpath)
+        for include_filename in includes:
+            cls.read_configfile_with_includes(parser, include_filename,
+                                              include_cache, include_stack)
+        include_stack.pop()
+        merge_config_data(parser, data)
+
+    @classmethod
+    def read_config_fragments(cls, parser):
+        """Read the config fragments of the fragment directories
+        (concurrently) and merge them into the :param:`parser` in lexical
+        order. Unchanged fragments are not parsed again.
+
+        :param parser:  Config parser to use (as outgoing param).
+        :return: List of merged config fragment file names.
+        """
+        fragment_names = list(generate_config_fragment_names(
+            cls.config_fragment_dirs, cls.config_searchpath,
+            cls.config_fragment_pattern))
+        read_fragment = cls.fragment_cache.read
+        if len(fragment_names) <= 1 or cls.config_fragment_workers == 1:
+            fragments = [read_fragment(name) for name in fragment_names]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(cls.config_fragment_workers) as executor:
+                fragments = list(executor.map(read_fragment, fragment_names))
+
+        for data in fragments:
+            merge_config_data(parser, data)
+        return fragment_names
+
+    @classmethod
+    def compile_env_index(cls):
+        """Build the index for the environment variable overlay (once)
+        from the config section schemas.
+
+        :return: Env index (as dict with: sections, params).
+        """
+        env_index = cls.__dict__.get("_env_index", None)
+        if env_index is None:
+            sections = {}
+            params = {}
+            for schema in cls.config_section_schemas:
+                for section_name in schema.section_names:
+                    if not has_wildcards(section_name):
+                        sections[make_env_name(section_name)] = section_name
+                params[schema] = dict(
+                    (make_env_name(name), name)
+                    for name, _ in select_params_from_section_schema(schema))
+            env_index = cls._env_index = dict(sections=sections, params=params)
+        return env_index
+
+    @classmethod
+    def apply_env_overlay(cls, parser, environ=None):
+        """Override config file params with environment variables, like:
+        ``{PREFIX}_{SECTION}__{PARAM}=value`` (section/param in uppercase,
+        non-alphanumeric chars replaced by "_").
+        Sections that match a wildcard schema are supported if they exist
+        in the config files. Values are converted like config file values.
+
+        .. sourcecode:: sh
+
+            # -- PREFIX: HELLO  SECTION: hello.more.alice  PARAM: numbers
+            export HELLO_HELLO_MORE_ALICE__NUMBERS="1 2 3"
+
+        :param parser:  Config parser to use (as outgoing param).
+        :param environ: Environment variables to use (default: os.environ).
+        """
+        if environ is None:
+            environ = os.environ
+        env_index = cls.compile_env_index()
+        sections = dict(env_index["sections"])
+        for section_name in parser.sections():
+            sections.setdefault(make_env_name(section_name), section_name)
+
+        prefix = make_env_name(cls.config_env_prefix) + "_"
+        for env_name, text in environ.items():
+            env_name = env_name.upper()
+            if not env_name.startswith(prefix):
+                continue
+            section_key, _, param_key = env_name[len(prefix):].partition("__")
+            section_name = sections.get(section_key, None)
+            if section_name is None:
+                continue
+            schema = cls.select_config_schema_for(section_name)
+            name = env_index["params"].get(schema, {}).get(param_key, None)
+            if name is None:
+                continue
+            if not parser.has_section(section_name):
+                parser.add_section(section_name)
+            if cls.config_interpolation:
+                # -- HINT: Escape "%" to disable interpolation of env values.
+                text = text.replace("%", "%%")
+            parser.set(section_name, name, text)
+
+    @classmethod
+    def validate_paths_in_batch(cls, config_sections, keys=None):
+        """Collect the values of all path-typed params in the selected
+        config sections and validate them together (in a thread pool).
+
+        :param config_sections: Selected config sections to process.
+        :param keys:            Optional param names of interest (projection).
+        :return: Validated batch (as :class:`PathValidationBatch`).
+        """
+        batch = PathValidationBatch(cls.batch_path_validation_workers,
+                                    profile=cls.profile_conversions)
+        for config_section in config_sections:
+            schema = cls.select_config_schema_for(config_section.name)
+            if not schema:
+                continue    # -- REPORTED BY: process_config_section()
+            for name, param in select_params_from_section_schema(schema,
+                                                                 names=keys):
+                text = config_section.get(name, None)
+                if text is not None and batch.accepts(param):
+                    batch.add(param, text)
+        batch.validate()
+        return batch
+
     @classmethod
     def collect_config_sections_from_schemas(cls, config_section_schemas=None):
         # pylint: disable=invalid-name
@@ -428,9 +2843,19 @@ class ConfigFileReader(object):
     # -- SPECIFIC PART:
     # Specifies which schema to use and where data should be stored.
     @classmethod
-    def process_config_section(cls, config_section, storage):
+    def process_config_section(cls, config_section, storage, keys=None,
+                               batch=None, query=None, deduplicator=None,
+                               profiler=None):
         """Process the config section and store the extracted data in
         the param:`storage` (as outgoing param).
+
+        :param config_section:  Config section to process.
+        :param storage:     Data storage to use (as outgoing param).
+        :param keys:        Optional param names of interest (projection).
+        :param batch:       Optional, validated path values (for path params).
+        :param query:       Optional :class:`SectionQuery` to update.
+        :param deduplicator:    Optional :class:`ValueDeduplicator` to use.
+        :param profiler:    Optional :class:`ConversionProfiler` to use.
         """
         # -- CONCEPT:
         # if not storage:
@@ -443,10 +2868,143 @@ class ConfigFileReader(object):
             raise LookupError(message % config_section.name)
 
         # -- PARSE AND STORE CONFIG SECTION:
+        section_data = parse_config_section(config_section, schema,
+                                            keys=keys, batch=batch,
+                                            lazy_files=cls.lazy_files,
+                                            profiler=profiler)
+        if deduplicator is not None:
+            section_data = deduplicator.deduplicate_section(section_data)
+        if cls.lazy_files:
+            cls.track_lazy_files(section_data)
+        if query is not None:
+            query.update_section(config_section.name, section_data,
+                                 select_indexed_param_names(schema))
+        if cls.section_columns and cls.get_columns_name_for(schema):
+            cls.store_section_columns(config_section.name, schema,
+                                      section_data, storage)
+            return
+        elif cls.section_records:
+            cls.store_section_record(config_section.name, schema,
+                                     section_data, storage)
+            return
         section_storage = cls.select_storage_for(config_section.name, storage)
-        section_data = parse_config_section(config_section, schema)
+        if cls.nested_storage:
+            cls.check_nested_storage_conflicts(config_section.name,
+                                               section_data, section_storage)
         section_storage.update(section_data)
 
+    @classmethod
+    def get_columns_name_for(cls, schema):
+        """Selects where to store the :class:`SectionColumns` of a schema.
+
+        :param schema:  Config section schema.
+        :return: First wildcard section name of the schema, like "foo.*".
+        :return: None, for schemas without wildcard section names.
+        """
+        for section_name in schema.section_names:
+            if has_wildcards(section_name):
+                return section_name
+        return None
+
+    @classmethod
+    def store_section_columns(cls, section_name, schema, section_data,
+                              storage):
+        """Store the config section data as row in the :class:`SectionColumns`
+        of its schema (for large families of wildcard-matched sections).
+        The storage name of the section provides its row (as
+        :class:`SectionRowView`), so dict-style access keeps working.
+        """
+        columns_name = cls.get_columns_name_for(schema)
+        columns = storage.get(columns_name, None)
+        if columns is None:
+            columns = storage[columns_name] = SectionColumns(schema)
+        storage_name = cls.get_storage_name_for(section_name)
+        columns.add(storage_name, section_data)
+        if storage_name:
+            storage[storage_name] = columns[storage_name]
+
+    @classmethod
+    def store_section_record(cls, section_name, schema, section_data, storage):
+        """Store the config section data as :class:`SectionRecord` object.
+        The primary config section is merged into the :param:`storage`.
+        """
+        storage_name = cls.get_storage_name_for(section_name)
+        if not storage_name:
+            storage.update(section_data)
+            return
+
+        existing = storage.get(storage_name, None)
+        if existing is not None:
+            if isinstance(existing, SectionRecord):
+                data = existing._asdict()
+            else:
+                data = dict(existing)
+            data.update(section_data)
+            section_data = data
+        record_class = make_section_record_class(schema)
+        storage[storage_name] = record_class(**section_data)
+
+    @classmethod
+    def track_lazy_files(cls, section_data):
+        """Remember the lazy files of a config section for :meth:`close_files()`.
+        """
+        lazy_files = cls.__dict__.get("_lazy_files", None)
+        if lazy_files is None:
+            lazy_files = cls._lazy_files = weakref.WeakSet()
+        for value in section_data.values():
+            if isinstance(value, LazySequence):
+                # -- CONVERTS ON ACCESS: Track the files created later.
+                value.convert = partial(convert_tracked_lazy_file,
+                                        value.convert, lazy_files)
+                continue
+            values = value
+            if (not isinstance(value, Sequence) or
+                    isinstance(value, string_types)):
+                values = [value]
+            for value in values:
+                if isinstance(value, LazyConfigFile):
+                    lazy_files.add(value)
+
+    @classmethod
+    def close_files(cls):
+        """Close all lazy files of this reader that were opened (by using
+        them). Use it when the config data is no longer needed, like:
+
+        .. sourcecode::
+
+            storage = ConfigFileProcessor.read_config()
+            try:
+                ...
+            finally:
+                ConfigFileProcessor.close_files()
+        """
+        lazy_files = cls.__dict__.get("_lazy_files", None)
+        if lazy_files is None:
+            return
+        for lazy_file in list(lazy_files):
+            lazy_file.close()
+        lazy_files.clear()
+
+    @classmethod
+    def compile_section_router(cls, name="_section_router", section_names=None):
+        """Build the :class:`SectionRouter` (once) for the config section
+        schemas (or for the section names/patterns, like: config_sections).
+
+        :param name:    Attribute name of the router (per reader class).
+        :param section_names:   Optional section names/patterns to use.
+        :return: Section router.
+        """
+        router = cls.__dict__.get(name, None)
+        if router is None:
+            if section_names is None:
+                router = SectionRouter(cls.config_section_schemas)
+            else:
+                router = SectionRouter()
+                for section_name in section_names:
+                    router.add(section_name, section_name)
+            setattr(cls, name, router)
+        return router
+
     @classmethod
     def select_config_schema_for(cls, section_name):
         """Select the config schema that matches the config section (by name).
@@ -454,6 +3012,9 @@ class ConfigFileReader(object):
         :param section_name:    Config section name (as key).
         :return: Config section schmema to use (subclass of: SectionSchema).
         """
+        if cls.section_router:
+            return cls.compile_section_router().route(section_name)
+
         # pylint: disable=cell-var-from-loop, redefined-outer-name
         for section_schema in cls.config_section_schemas:
             schema_matches = getattr(section_schema, "matches_section", None)
@@ -492,6 +3053,9 @@ class ConfigFileReader(object):
         :param storage:         Data storage to use.
         :return: :param:`storage` or a part of it (as section storage).
         """
+        if cls.nested_storage:
+            return cls.select_nested_storage_for(section_name, storage)
+
         section_storage = storage
         storage_name = cls.get_storage_name_for(section_name)
         if storage_name:
@@ -499,3 +3063,425 @@ class ConfigFileReader(object):
             if section_storage is None:
                 section_storage = storage[storage_name] = dict()
         return section_storage
+
+    @classmethod
+    def get_storage_path_for(cls, section_name):
+        """Provides the storage path of a config section for the
+        :attr:`nested_storage` (one part per segment of its storage name).
+
+        .. sourcecode::
+
+            # -- STORAGE NAME: svc.eu.c1.host
+            path = ConfigFileProcessor.get_storage_path_for("svc.eu.c1.host")
+            assert path == ("svc", "eu", "c1", "host")
+
+        :param section_name:    Config section (name) to process.
+        :return: Storage path (as tuple). Empty tuple, for MERGE-WITH-DEFAULTS.
+        """
+        storage_name = cls.get_storage_name_for(section_name)
+        if not storage_name:
+            return ()
+        return tuple(storage_name.split("."))
+
+    @classmethod
+    def check_nested_storage_conflicts(cls, section_name, section_data,
+                                       section_storage):
+        """Checks that the params of a config section do not override
+        the nested storage of other config sections (for: nested_storage).
+
+        :raises ValueError: If a param conflicts with a nested storage.
+        """
+        for name in section_data:
+            if isinstance(section_storage.get(name, None), dict):
+                message = "%s: Storage path conflicts with param %r"
+                raise ValueError(message % (section_name, name))
+
+    @classmethod
+    def select_nested_storage_for(cls, section_name, storage):
+        """Selects the nested data storage for a config section, like:
+        ``storage["svc"]["eu"]["c1"]["host"]`` for section "svc.eu.c1.host".
+
+        :param section_name:    Config section (name) to process.
+        :param storage:         Data storage to use.
+        :return: :param:`storage` or a nested part of it (as section storage).
+        :raises ValueError: If the storage path conflicts with a param value.
+        """
+        section_storage = storage
+        for segment in cls.get_storage_path_for(section_name):
+            child_storage = section_storage.get(segment, None)
+            if child_storage is None:
+                child_storage = section_storage[segment] = dict()
+            elif not isinstance(child_storage, dict):
+                message = "%s: Storage path conflicts with param %r"
+                raise ValueError(message % (section_name, segment))
+            section_storage = child_storage
+        return section_storage
+
+
+# -----------------------------------------------------------------------------
+# CONFIG SNAPSHOTS: For multi-threaded servers.
+# -----------------------------------------------------------------------------
+def freeze_storage(storage):
+    """Provides a read-only deep copy of a storage (as snapshot):
+    dicts become read-only mappings and lists become tuples.
+    Other values are shared (should be immutable).
+
+    :raises ValueError: For section records or section columns
+        (they cannot be frozen).
+    """
+    if isinstance(storage, (SectionRecord, SectionColumns, SectionRowView)):
+        message = "freeze_storage: Not supported for %s (mutable)"
+        raise ValueError(message % storage.__class__.__name__)
+    elif isinstance(storage, dict):
+        frozen = dict((key, freeze_storage(value))
+                      for key, value in storage.items())
+        try:
+            return types.MappingProxyType(frozen)
+        except AttributeError:  # pragma: no cover
+            return frozen       # -- PYTHON2: Not read-only.
+    elif isinstance(storage, list):
+        return tuple(freeze_storage(value) for value in storage)
+    return storage
+
+
+class ConfigSnapshotHolder(object):
+    """Holds the current read-only snapshot of the storage of a reader class.
+    Worker threads get the snapshot with one attribute read (without locks).
+    A reload builds and validates the new snapshot and publishes it with
+    one reference swap (readers are never blocked, only reloads serialize).
+
+    .. sourcecode::
+
+        holder = ConfigSnapshotHolder(ConfigFileProcessor)
+        holder.reload()
+
+        # -- WORKER THREAD:
+        config = holder.snapshot
+        name = config["name"]
+
+        # -- RELOAD THREAD:
+        holder.reload_in_background()
+
+    :param reader_class:    Reader class (or for_root() reader) to use.
+    :param validate:        Optional callable to check a new storage
+                            (raises an error to keep the current snapshot).
+    :raises ValueError: If the reader class uses section_records or
+        section_columns (these storages cannot be frozen).
+    """
+
+    def __init__(self, reader_class, validate=None):
+        if reader_class.section_records or reader_class.section_columns:
+            raise ValueError("ConfigSnapshotHolder: Not supported with "
+                             "section_records or section_columns")
+        self.reader_class = reader_class
+        self.validate = validate
+        self.snapshot = None
+        self.version = 0
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+
+    def get(self):
+        """Provides the current snapshot (reloads it on first use)."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            snapshot = self.reload()
+        return snapshot
+
+    def reload(self):
+        """Reads the configuration again and publishes the new snapshot.
+
+        :return: New snapshot.
+        :raises: Errors of read_config() or validate (snapshot is kept).
+        """
+        with self._reload_lock:
+            storage = self.reader_class.read_config()
+            if self.validate is not None:
+                self.validate(storage)
+            snapshot = freeze_storage(storage)
+            self.version += 1
+            self.snapshot = snapshot    # -- ATOMIC: Reference swap.
+        return snapshot
+
+    def reload_in_background(self):
+        """Reloads the snapshot in a daemon thread.
+        Errors are stored in :attr:`last_error` (snapshot is kept).
+
+        :return: Thread that performs the reload.
+        """
+        def reload_snapshot():
+            try:
+                self.reload()
+                self.last_error = None
+            except Exception as e:  # pylint: disable=broad-except
+                self.last_error = e
+
+        thread = threading.Thread(target=reload_snapshot)
+        thread.daemon = True
+        thread.start()
+        return thread
+
+
+# -----------------------------------------------------------------------------
+# CONFIG SERVER: Provides warm storages to short-lived CLI processes.
+# -----------------------------------------------------------------------------
+def default_config_server_socket():
+    """Provides the default socket name of the config server
+    (in $XDG_RUNTIME_DIR or in the temp directory, per user).
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", None)
+    if runtime_dir:
+        return os.path.join(runtime_dir, "click_configfile.sock")
+    import tempfile
+    return os.path.join(tempfile.gettempdir(),
+                        "click_configfile-%d.sock" % os.getuid())
+
+
+def get_reader_name(reader_class):
+    """Provides the name of a reader class, like: "hello_command:Reader"."""
+    class_name = getattr(reader_class, "__qualname__", reader_class.__name__)
+    return "%s:%s" % (reader_class.__module__, class_name)
+
+
+def load_reader_class(reader_name):
+    """Imports a reader class by its name, like: "hello_command:Reader".
+
+    :param reader_name: Reader class name (as "{module}:{class}").
+    :return: Reader class.
+    :raises ValueError: If the reader name is invalid.
+    :raises ImportError: If the module cannot be imported.
+    :raises AttributeError: If the module has no such class.
+    """
+    import importlib
+    module_name, _, class_name = reader_name.partition(":")
+    if not module_name or not class_name:
+        raise ValueError("%s (expected: {module}:{class})" % reader_name)
+    reader_class = importlib.import_module(module_name)
+    for name in class_name.split("."):
+        reader_class = getattr(reader_class, name)
+    return reader_class
+
+
+def request_config_from_server(socket_name, reader_name, root, timeout=None):
+    """Requests the storage of a reader class for a config root directory
+    from the config server (each socket operation uses the timeout).
+
+    :param socket_name: Unix domain socket of the config server.
+    :param reader_name: Reader class name (as "{module}:{class}").
+    :param root:        Config root directory (normally: current directory).
+    :param timeout:     Timeout per socket operation (in seconds).
+    :return: Storage (as dict).
+    :raises EnvironmentError: If the config server is not available.
+    :raises ValueError: If the socket is not owned by the current user.
+    :raises LookupError: If the config server cannot provide the storage.
+    """
+    import json
+    import pickle
+    import socket
+    if os.stat(socket_name).st_uid != os.getuid():
+        # -- SECURITY: Only unpickle data from own config server.
+        raise ValueError("%s: Not owned by current user" % socket_name)
+
+    request = json.dumps(dict(reader=reader_name, root=root)) + "\n"
+    chunks = []
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(timeout)
+        client.connect(socket_name)
+        client.sendall(request.encode("UTF-8"))
+        client.shutdown(socket.SHUT_WR)
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        client.close()
+    status, payload = pickle.loads(b"".join(chunks))
+    if status != "OK":
+        raise LookupError(payload)
+    return payload
+
+
+class ConfigServer(object):
+    """Local config server that provides the storages of registered reader
+    classes over a Unix domain socket. The storages are kept warm per config
+    root directory (by using :meth:`ConfigFileReader.for_root()`) and are
+    revalidated on each request (config file fingerprints).
+
+    .. sourcecode:: sh
+
+        $ python -m click_configfile serve hello_command:ConfigFileProcessor
+
+    .. sourcecode::
+
+        # -- CLIENT SIDE: Falls back to in-process reading.
+        class ConfigFileProcessor(ConfigFileReader):
+            config_server_socket = default_config_server_socket()
+
+    PROTOCOL: JSON request line ``{"reader": ..., "root": ...}``,
+    pickled response ``("OK", storage)`` or ``("ERROR", message)``.
+    """
+
+    def __init__(self, socket_name=None, reader_classes=None):
+        self.socket_name = socket_name or default_config_server_socket()
+        self.readers = {}
+        self.server = None
+        self._lock = threading.Lock()
+        for reader_class in reader_classes or []:
+            self.register(reader_class)
+
+    def register(self, reader_class):
+        self.readers[get_reader_name(reader_class)] = reader_class
+
+    def read_storage(self, reader_name, root):
+        reader_class = self.readers.get(reader_name, None)
+        if reader_class is None:
+            raise LookupError("Unknown reader: %s" % reader_name)
+        with self._lock:
+            return reader_class.for_root(root).read_config()
+
+    def handle_request(self, request):
+        """Processes one request and provides the (pickled) response."""
+        import json
+        import pickle
+        try:
+            data = json.loads(request.decode("UTF-8"))
+            storage = self.read_storage(data["reader"], data["root"])
+            return pickle.dumps(("OK", storage), pickle.HIGHEST_PROTOCOL)
+        except Exception as e:  # pylint: disable=broad-except
+            # -- EXAMPLES: Unknown reader, invalid config, not picklable, ...
+            message = "%s: %s" % (e.__class__.__name__, e)
+            return pickle.dumps(("ERROR", message), pickle.HIGHEST_PROTOCOL)
+
+    def make_server(self):
+        """Creates the socket server (and removes a stale socket file)."""
+        try:
+            import socketserver
+        except ImportError:     # pragma: no cover
+            import SocketServer as socketserver     # -- PYTHON2
+        config_server = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                response = config_server.handle_request(self.rfile.readline())
+                try:
+                    self.wfile.write(response)
+                except EnvironmentError:
+                    pass    # -- CLIENT GONE: Timeout, ...
+
+        class UnixServer(socketserver.ThreadingMixIn,
+                         socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        if os.path.exists(self.socket_name):
+            os.remove(self.socket_name)
+        umask = os.umask(0o177)     # -- SOCKET: Only for current user.
+        try:
+            self.server = UnixServer(self.socket_name, RequestHandler)
+        finally:
+            os.umask(umask)
+        return self.server
+
+    def serve_forever(self):
+        server = self.server or self.make_server()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_name):
+                os.remove(self.socket_name)
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+# -----------------------------------------------------------------------------
+# COMMAND-LINE: python -m click_configfile ...
+# -----------------------------------------------------------------------------
+def explain_reader(reader_class):
+    """Reads the configuration of a reader class with conversion profiling
+    (without changing the reader class).
+
+    :param reader_class:    Reader class to use.
+    :return: Dict with: configfiles, sections, conversions (sorted by time).
+    """
+    profiling_reader_class = type(reader_class.__name__, (reader_class,),
+                                  dict(profile_conversions=True,
+                                       cache_storage=False,
+                                       config_server_socket=None))
+    profiling_reader_class.read_config()
+    configfile_names = list(generate_configfile_names(
+        reader_class.config_files, reader_class.config_searchpath,
+        reader_class.missing_file_cache))
+    if reader_class.config_fragment_dirs:
+        configfile_names.extend(generate_config_fragment_names(
+            reader_class.config_fragment_dirs, reader_class.config_searchpath,
+            reader_class.config_fragment_pattern))
+    profile = profiling_reader_class.stats["conversions"]
+    return dict(configfiles=configfile_names, sections=profile["sections"],
+                conversions=profile["params"])
+
+
+def make_command_line():
+    import click
+
+    @click.group()
+    def command_line():
+        """Tools for click_configfile readers."""
+
+    @command_line.command()
+    @click.option("--socket", "socket_name", default=None,
+                  help="Unix domain socket to use.")
+    @click.argument("readers", nargs=-1, required=True)
+    def serve(socket_name, readers):
+        """Serve the storages of READERS (as: {module}:{class})."""
+        try:
+            reader_classes = [load_reader_class(name) for name in readers]
+        except (ValueError, ImportError, AttributeError) as e:
+            raise click.UsageError("Cannot load reader: %s" % e)
+        config_server = ConfigServer(socket_name, reader_classes)
+        click.echo("SERVE: %s (readers: %s)" % (config_server.socket_name,
+                                                ", ".join(readers)))
+        try:
+            config_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    @command_line.command()
+    @click.option("-n", "--top", "count", type=int, default=10,
+                  show_default=True, help="Number of conversions to show.")
+    @click.argument("reader")
+    def explain(reader, count):
+        """Explain how READER (as: {module}:{class}) reads its config."""
+        try:
+            reader_class = load_reader_class(reader)
+        except (ValueError, ImportError, AttributeError) as e:
+            raise click.UsageError("Cannot load reader: %s" % e)
+        explanation = explain_reader(reader_class)
+        click.echo("CONFIG FILES:")
+        for configfile_name in explanation["configfiles"]:
+            click.echo("  %s" % configfile_name)
+        click.echo("SECTIONS:")
+        for entry in explanation["sections"]:
+            click.echo("  %(section)-30s schema=%(schema)s  calls=%(calls)d  "
+                       "total=%(total).6fs" % entry)
+        click.echo("TOP CONVERSIONS:")
+        for entry in explanation["conversions"][:count]:
+            click.echo("  %-30s calls=%d  total=%.6fs  worst=%.6fs" % (
+                "%(schema)s.%(param)s" % entry, entry["calls"],
+                entry["total"], entry["worst"]))
+
+    return command_line
+
+
+def main(args=None):
+    command_line = make_command_line()
+    return command_line.main(args=args, prog_name="python -m click_configfile")
+
+
+if __name__ == "__main__":
+    # -- DELEGATE: To the importable module (that reader modules import).
+    #    Otherwise, classes like AncestorSearchpath would exist twice.
+    from click_configfile import main as _main
+    _main()
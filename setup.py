@@ -115,7 +115,6 @@ setup(
     python_requires=">=2.7, !=3.0.*, !=3.1.*",
     install_requires=[
         "click >= 6.6",
-        "six >= 1.15",
         "configparser >= 3.5.0; python_version < '3.5'",
     ],
     tests_require=[
@@ -123,6 +122,7 @@ setup(
         "pytest >= 5.0; python_version >= '3.0'",
         "pytest-html >= 1.19.0,<2.0; python_version <  '3.0'",
         "pytest-html >= 2.0,<4.0;    python_version >= '3.0'",
+        "six >= 1.15",
     ],
 #     extras_require={
 #         # -- SUPPORT-WHEELS: Extra packages for Python2.6 and ...
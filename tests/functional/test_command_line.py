@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+"""
+Functional tests for the command-line: ``python -m click_configfile ...``
+"""
+
+from __future__ import absolute_import, print_function
+import os
+import subprocess
+import sys
+from textwrap import dedent
+from tests._test_support import write_configfile_with_contents
+from click_configfile import ConfigFileReader, Param, SectionSchema, \
+    matches_section, make_command_line
+import click
+
+
+TOPDIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# -----------------------------------------------------------------------------
+# TEST CANDIDATE:
+# -----------------------------------------------------------------------------
+@matches_section("hello")
+class HelloSchema(SectionSchema):
+    name = Param(type=str)
+    path = Param(type=click.Path(exists=True))
+
+
+class ConfigFileProcessor(ConfigFileReader):
+    config_files = ["hello.ini"]
+    config_section_schemas = [HelloSchema]
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE
+# -----------------------------------------------------------------------------
+class TestExplainCommand(object):
+
+    def test_explain__shows_files_sections_and_conversions(self,
+                                                        cli_runner_isolated):
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+            path = hello.ini
+            """)
+        result = cli_runner_isolated.invoke(make_command_line(), [
+            "explain", "--top=1", "%s:ConfigFileProcessor" % __name__])
+        assert result.exit_code == 0, result.output
+        assert "CONFIG FILES:\n  ./hello.ini\n" in result.output
+        assert "schema=HelloSchema" in result.output
+        top_conversions = result.output.split("TOP CONVERSIONS:\n")[1]
+        assert len(top_conversions.splitlines()) == 1
+        assert ConfigFileProcessor.stats is None
+
+    def test_explain__with_unknown_reader_fails(self, cli_runner):
+        result = cli_runner.invoke(make_command_line(),
+                                   ["explain", "unknown_module:Reader"])
+        assert result.exit_code == 2
+        assert "Cannot load reader" in result.output
+
+    def test_explain__with_python_m_and_ancestor_searchpath(self,
+                                                        isolated_filesystem):
+        # -- ENSURE: Reader module and "__main__" use the same module classes.
+        write_configfile_with_contents("reader_module.py", dedent("""
+            from click_configfile import ConfigFileReader, Param, \\
+                SectionSchema, AncestorSearchpath, matches_section
+
+            @matches_section("hello")
+            class HelloSchema(SectionSchema):
+                name = Param(type=str)
+
+            class ConfigFileProcessor(ConfigFileReader):
+                config_files = ["hello.ini"]
+                config_searchpath = [AncestorSearchpath(".")]
+                config_section_schemas = [HelloSchema]
+            """))
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+            """)
+        env = dict(os.environ, PYTHONPATH=TOPDIR)
+        command = [sys.executable, "-m", "click_configfile", "explain",
+                   "reader_module:ConfigFileProcessor"]
+        output = subprocess.check_output(command, stderr=subprocess.STDOUT,
+                                         env=env)
+        assert "hello.ini" in output.decode("UTF-8")
+        assert "schema=HelloSchema" in output.decode("UTF-8")
@@ -0,0 +1,192 @@
+# -*- coding: UTF-8 -*-
+"""
+Complexity regression tests: Run the core functions with generated data
+at several input sizes, fit the empirical growth rate (exponent ``k``
+of ``time ~ size**k``) and fail if it exceeds the declared bound.
+The growth rate (unlike absolute times) does not depend on machine speed.
+
+These tests are slow and are only run on request (marker: complexity)::
+
+    pytest -m complexity
+"""
+
+from __future__ import absolute_import, print_function
+import gc
+import math
+import os.path
+import time
+from tests._test_support import write_configfile_with_contents
+from click_configfile import ConfigFileReader, Param, SectionSchema, \
+    matches_section, assign_param_names
+from click_configfile import generate_configfile_names, parse_config_section
+import pytest
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+SIZES = [1000, 2000, 4000, 8000]
+NEAR_LINEAR = 1.35      # ALLOWS: O(n log n) and measurement noise.
+MIN_DURATION = 0.05     # SECONDS: Per measurement (repeats fast functions).
+clock = getattr(time, "perf_counter", time.time)
+
+
+def measure_time(function, repeat=5, min_duration=MIN_DURATION):
+    """Provides the best time of one function call (in seconds).
+    Each measurement repeats the function until it takes at least
+    :param:`min_duration` (timer resolution and noise of short runs).
+    """
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            loops = 0
+            start_time = clock()
+            while True:
+                function()
+                loops += 1
+                duration = clock() - start_time
+                if duration >= min_duration:
+                    break
+            timings.append(duration / loops)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return min(timings)
+
+
+def fit_growth_rate(sizes, timings):
+    """Fits ``log(time) = k * log(size) + c`` (least squares).
+
+    :return: Growth rate exponent k (1.0: linear, 2.0: quadratic).
+    """
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(timing, 1e-9)) for timing in timings]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    covariance = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    variance = sum((x - x_mean) ** 2 for x in xs)
+    return covariance / variance
+
+
+def assert_growth_rate(make_function, bound=NEAR_LINEAR, sizes=None,
+                       attempts=3):
+    """Measures the function (provided per size) for all sizes
+    and checks its growth rate (best of some attempts, to ignore outliers
+    caused by other processes).
+    """
+    sizes = sizes or SIZES
+    functions = [make_function(size) for size in sizes]
+    for _ in range(attempts):
+        timings = [measure_time(function) for function in functions]
+        growth_rate = fit_growth_rate(sizes, timings)
+        if growth_rate <= bound:
+            break
+    assert growth_rate <= bound, \
+        "growth rate: %.2f (expected: <= %.2f), timings: %r" % \
+        (growth_rate, bound, timings)
+
+
+def make_config_parser_with(contents):
+    import configparser
+    parser = configparser.ConfigParser()
+    parser.read_string(contents)
+    return parser
+
+
+# -----------------------------------------------------------------------------
+# TEST CANDIDATE:
+# -----------------------------------------------------------------------------
+@assign_param_names
+class ConfigSectionSchema(object):
+
+    @matches_section("hello")
+    class Hello(SectionSchema):
+        name = Param(type=str)
+
+    @matches_section("hello.host.*")
+    class HelloHost(SectionSchema):
+        port = Param(type=int)
+        roles = Param(type=str, multiple=True)
+
+
+class ConfigFileProcessor(ConfigFileReader):
+    config_files = ["hello.ini"]
+    config_section_schemas = [
+        ConfigSectionSchema.Hello,
+        ConfigSectionSchema.HelloHost,
+    ]
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE
+# -----------------------------------------------------------------------------
+class TestGrowthRate(object):
+
+    @pytest.mark.parametrize("timings, expected", [
+        ([1.0, 2.0, 4.0, 8.0], 1.0),
+        ([1.0, 4.0, 16.0, 64.0], 2.0),
+    ])
+    def test_fit_growth_rate(self, timings, expected):
+        growth_rate = fit_growth_rate(SIZES, timings)
+        assert abs(growth_rate - expected) < 1e-6
+
+
+@pytest.mark.complexity
+class TestComplexity(object):
+
+    def test_read_config__is_near_linear_in_sections(self,
+                                                     isolated_filesystem):
+        def make_function(size):
+            filename = "size_%d/hello.ini" % size
+            contents = ["[hello]", "name = Alice"]
+            for index in range(size):
+                contents.extend(["[hello.host.h%d]" % index,
+                                 "port = %d" % (8000 + index),
+                                 "roles = db web"])
+            write_configfile_with_contents(filename, "\n".join(contents))
+
+            class SizedConfigFileProcessor(ConfigFileProcessor):
+                config_searchpath = [os.path.dirname(filename)]
+
+            def function():
+                storage = SizedConfigFileProcessor.read_config()
+                assert len(storage) == size + 1
+            return function
+
+        assert_growth_rate(make_function)
+
+    def test_parse_config_section__is_near_linear_in_params(self):
+        def make_function(size):
+            names = ["param%d" % index for index in range(size)]
+            schema = assign_param_names(type("Schema", (SectionSchema,),
+                dict((name, Param(type=int)) for name in names)))
+            contents = "[hello]\n" + "\n".join("%s = %d" % (name, index)
+                                               for index, name in
+                                               enumerate(names))
+            config_section = make_config_parser_with(contents)["hello"]
+
+            def function():
+                data = parse_config_section(config_section, schema)
+                assert len(data) == size
+            return function
+
+        assert_growth_rate(make_function)
+
+    def test_generate_configfile_names__is_near_linear_in_searchpath(self,
+                                                        isolated_filesystem):
+        def make_function(size):
+            searchpath = ["size_%d/dir%d" % (size, index)
+                          for index in range(size)]
+            for directory in searchpath[::2]:
+                write_configfile_with_contents(
+                    os.path.join(directory, "hello.ini"), "[hello]\n")
+
+            def function():
+                names = list(generate_configfile_names(["hello.ini"],
+                                                       searchpath))
+                assert len(names) == (size + 1) // 2
+            return function
+
+        assert_growth_rate(make_function, sizes=[250, 500, 1000, 2000])
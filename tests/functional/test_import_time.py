@@ -0,0 +1,67 @@
+# -*- coding: UTF-8 -*-
+"""
+Import-time regression tests (by using: ``python -X importtime``).
+
+Heavy modules should only be imported when they are needed
+(on first Param construction or on first read_config() call).
+"""
+
+from __future__ import absolute_import, print_function
+import os.path
+import subprocess
+import sys
+import pytest
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+HERE = os.path.dirname(os.path.abspath(__file__))
+TOPDIR = os.path.normpath(os.path.join(HERE, "..", ".."))
+LAZY_MODULES = ["click", "click.types", "configparser", "fnmatch",
+                "inspect", "six"]
+
+
+def collect_imported_modules(statement):
+    """Runs the statement in a Python process (without site-packages noise)
+    and provides the imported modules from the ``-X importtime`` output.
+
+    :return: Dict of imported module names with cumulative time (in usec).
+    """
+    code = "import sys; sys.path.insert(0, %r); %s" % (TOPDIR, statement)
+    command = [sys.executable, "-S", "-X", "importtime", "-c", code]
+    output = subprocess.check_output(command, stderr=subprocess.STDOUT)
+    modules = {}
+    for line in output.decode("UTF-8").splitlines():
+        # -- LINE: import time: {self_usec} | {cumulative_usec} | {module}
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module_name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            modules[module_name.strip()] = int(cumulative)
+    return modules
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE
+# -----------------------------------------------------------------------------
+requires_importtime = pytest.mark.skipif(sys.version_info < (3, 7),
+                                         reason="REQUIRES: python -X importtime")
+
+
+@requires_importtime
+class TestImportTime(object):
+
+    def test_import__does_not_import_lazy_modules(self):
+        modules = collect_imported_modules("import click_configfile")
+        assert "click_configfile" in modules
+        imported_lazy_modules = [name for name in LAZY_MODULES
+                                 if name in modules]
+        assert imported_lazy_modules == []
+
+    def test_read_config__imports_lazy_modules_on_first_use(self):
+        modules = collect_imported_modules(
+            "import click_configfile; "
+            "click_configfile.ConfigFileReader.read_config()")
+        assert "configparser" in modules
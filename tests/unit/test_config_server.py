@@ -0,0 +1,107 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for :class:`click_configfile.ConfigServer` (and its client side).
+"""
+
+from __future__ import absolute_import, print_function
+import os.path
+import socket
+import threading
+from tests._test_support import write_configfile_with_contents
+from click_configfile import ConfigFileReader, ConfigServer, Param, \
+    SectionSchema, matches_section
+from click_configfile import get_reader_name, load_reader_class, \
+    request_config_from_server
+import pytest
+
+
+# -----------------------------------------------------------------------------
+# TEST CANDIDATE:
+# -----------------------------------------------------------------------------
+@matches_section("hello")
+class HelloSchema(SectionSchema):
+    name = Param(type=str)
+    number = Param(type=int)
+
+
+class ConfigFileProcessor(ConfigFileReader):
+    config_files = ["hello.ini"]
+    config_section_schemas = [HelloSchema]
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+requires_unix_socket = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"),
+                                          reason="REQUIRES: Unix socket")
+
+
+@pytest.fixture
+def config_server(isolated_filesystem):
+    socket_name = os.path.abspath("config_server.sock")
+    server = ConfigServer(socket_name, [ConfigFileProcessor])
+    server.make_server()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE
+# -----------------------------------------------------------------------------
+class TestConfigServer(object):
+
+    def test_get_reader_name__can_be_loaded(self):
+        reader_name = get_reader_name(ConfigFileProcessor)
+        assert reader_name == "%s:ConfigFileProcessor" % __name__
+        assert load_reader_class(reader_name) is ConfigFileProcessor
+
+    def test_load_reader_class__with_invalid_name_raises_error(self):
+        with pytest.raises(ValueError):
+            load_reader_class("ConfigFileProcessor")
+
+    @requires_unix_socket
+    def test_request__provides_storage_for_root(self, config_server):
+        write_configfile_with_contents("hello.ini",
+                                       "[hello]\nname = Alice\nnumber = 42\n")
+        storage = request_config_from_server(
+            config_server.socket_name, get_reader_name(ConfigFileProcessor),
+            os.getcwd(), timeout=5.0)
+        assert storage == dict(name="Alice", number=42)
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Bob\n")
+        storage = request_config_from_server(
+            config_server.socket_name, get_reader_name(ConfigFileProcessor),
+            os.getcwd(), timeout=5.0)
+        assert storage == dict(name="Bob")
+
+    @requires_unix_socket
+    def test_request__with_unknown_reader_raises_error(self, config_server):
+        with pytest.raises(LookupError) as e:
+            request_config_from_server(config_server.socket_name,
+                                       "unknown:Reader", os.getcwd(),
+                                       timeout=5.0)
+        assert "Unknown reader" in str(e.value)
+
+    @requires_unix_socket
+    def test_read_config__uses_config_server(self, config_server):
+        class ClientConfigFileProcessor(ConfigFileProcessor):
+            config_server_socket = config_server.socket_name
+            config_server_timeout = 5.0
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Alice\n")
+        config_server.register(ClientConfigFileProcessor)
+        assert ClientConfigFileProcessor.read_config() == dict(name="Alice")
+        root_readers = ClientConfigFileProcessor.__dict__["_root_readers"]
+        assert list(root_readers.keys()) == [os.path.abspath(os.getcwd())]
+
+    def test_read_config__without_config_server_reads_config_files(self,
+                                                        isolated_filesystem):
+        class ClientConfigFileProcessor(ConfigFileProcessor):
+            config_server_socket = os.path.abspath("missing.sock")
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Alice\n")
+        assert ClientConfigFileProcessor.read_config() == dict(name="Alice")
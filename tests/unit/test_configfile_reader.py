@@ -4,10 +4,15 @@ Unit tests for :class:`click_configfile.ConfigFileReader`.
 """
 
 from __future__ import absolute_import, print_function
-# PREPARED: import os.path
-# PREPARED: from tests._test_support import write_configfile_with_contents
+import io
+import os.path
+from tests._test_support import write_configfile_with_contents
 from click_configfile import Param, SectionSchema, ConfigFileReader
+from click_configfile import LazyConfigFile, ParsedFileCache
+from click_configfile import AncestorSearchpath
+from click_configfile import deep_size, format_memory_report
 from click_configfile import matches_section
+import click
 import pytest
 
 
@@ -60,16 +65,19 @@ class TestConfigFileReader(object):
         # -- SECTION NAME ENDS WITH: *.foo
         ("some.foo",  "schema2"),
         ("other.foo", "schema2"),
+        ("a.b.foo",   "schema2"),
         # -- SECTION NAME CONTAINS: *.foo.*
         ("loo.foo.bar", "schema3"),
         ("xxx.foo.zzz", "schema3"),
+        ("x.y.foo.z",   "schema3"),
         # -- UNBOUNDED/UNSUPPORTED: section names
         ("foo_bar",     None),
         ("baz_foo",     None),
         ("xxx_foo_zzz", None),
     ])
+    @pytest.mark.parametrize("section_router", [False, True])
     def test_select_config_schema_for__with_schema_using_wildcards(self,
-                                                section_name, expected_schema):
+                                section_name, expected_schema, section_router):
         # -- SETUP:
         @matches_section("foo.*")
         class ExampleSchema1(SectionSchema):
@@ -86,6 +94,7 @@ class TestConfigFileReader(object):
         class ConfigFileProcessor(ConfigFileReader):
             config_section_schemas = [
                 ExampleSchema1, ExampleSchema2, ExampleSchema3]
+        ConfigFileProcessor.section_router = section_router
 
         # -- PERFORM TEST:
         schema = ConfigFileProcessor.select_config_schema_for(section_name)
@@ -182,3 +191,812 @@ class TestConfigFileReader(object):
         # -- USE SECTION STORE:
         store.update(number=20)
         assert storage == store
+
+    # -- TESTS FOR: ConfigFileReader.read_config(sections=..., keys=...)
+    def test_read_config__with_sections_selects_only_these_sections(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        @matches_section("hello.more.*")
+        class HelloMoreSchema(SectionSchema):
+            numbers = Param(type=int, multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema, HelloMoreSchema]
+
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+
+            [hello.more.foo]
+            numbers = 1 2 3
+
+            [hello.more.bar]
+            numbers = 4 5
+            """)
+        storage = ConfigFileProcessor.read_config(sections=["hello.more.f*"])
+        assert storage == {"hello.more.foo": dict(numbers=[1, 2, 3])}
+
+    def test_read_config__with_keys_converts_only_these_params(self,
+                                                        isolated_filesystem):
+        class BadType(click.ParamType):
+            name = "bad"
+            def convert(self, value, param, ctx):
+                raise AssertionError("UNEXPECTED: convert(%r)" % value)
+
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            number = Param(type=int)
+            unused = Param(type=BadType())
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+            number = 42
+            unused = NOT_CONVERTED
+            """)
+        storage = ConfigFileProcessor.read_config(keys=["name", "number"])
+        assert storage == dict(name="Alice", number=42)
+
+    # -- TESTS FOR: ConfigFileReader.batch_path_validation
+    def test_read_config__with_batch_path_validation(self, isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            files = Param(type=click.Path(exists=True), multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            batch_path_validation = True
+
+        write_configfile_with_contents("alice.txt", "ALICE")
+        write_configfile_with_contents("bob.txt", "BOB")
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            files = alice.txt bob.txt alice.txt
+            """)
+        storage = ConfigFileProcessor.read_config()
+        assert storage == dict(files=["alice.txt", "bob.txt", "alice.txt"])
+
+    def test_read_config__with_batch_path_validation_and_lazy_param(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            files = Param(type=click.Path(exists=True), multiple=True,
+                          lazy=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            batch_path_validation = True
+
+        write_configfile_with_contents("a.txt", "A")
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            files = a.txt
+                MISSING.txt
+            """)
+        files = ConfigFileProcessor.read_config()["files"]
+        assert files[0] == "a.txt"
+        with pytest.raises(click.BadParameter) as exc_info:
+            files[1]
+        assert "hello.files" in exc_info.value.format_message()
+
+    def test_read_config__with_batch_path_validation_reports_section_param(
+            self, isolated_filesystem):
+        @matches_section("hello.*")
+        class HelloSchema(SectionSchema):
+            files = Param(type=click.Path(exists=True), multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            batch_path_validation = True
+
+        write_configfile_with_contents("alice.txt", "ALICE")
+        write_configfile_with_contents("hello.ini", """
+            [hello.foo]
+            files = alice.txt
+
+            [hello.bar]
+            files = alice.txt MISSING.txt
+            """)
+        with pytest.raises(click.BadParameter) as exc_info:
+            ConfigFileProcessor.read_config()
+        assert exc_info.value.param_hint == "hello.bar.files"
+        assert "MISSING.txt" in exc_info.value.format_message()
+
+    def test_read_config__with_batch_path_validation_opens_file_per_value(
+            self, isolated_filesystem):
+        @matches_section("hello*")
+        class HelloSchema(SectionSchema):
+            infile = Param(type=click.File("r"))
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_sections = ["hello", "hello.*"]
+            config_section_schemas = [HelloSchema]
+            batch_path_validation = True
+
+        write_configfile_with_contents("alice.txt", "ALICE")
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            infile = alice.txt
+
+            [hello.more]
+            infile = alice.txt
+            """)
+        storage = ConfigFileProcessor.read_config()
+        infile1 = storage["infile"]
+        infile2 = storage["hello.more"]["infile"]
+        assert infile1 is not infile2
+        assert infile1.read() == "ALICE"
+        assert infile2.read() == "ALICE"
+        infile1.close()
+        infile2.close()
+
+    # -- TESTS FOR: ConfigFileReader.lazy_files
+    def test_read_config__with_lazy_files_opens_on_first_use(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            infile = Param(type=click.File("r"))
+            outfile = Param(type=click.File("w"))
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            lazy_files = True
+
+        write_configfile_with_contents("alice.txt", "ALICE")
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            infile = alice.txt
+            outfile = unused.txt
+            """)
+        storage = ConfigFileProcessor.read_config()
+        infile = storage["infile"]
+        assert isinstance(infile, LazyConfigFile)
+        assert not infile.opened
+        assert infile.read() == "ALICE"
+        assert infile.opened
+        assert not os.path.exists("unused.txt")
+
+        ConfigFileProcessor.close_files()
+        assert infile.closed
+
+    @pytest.mark.parametrize("options", [
+        dict(deduplicate_values=True, deduplicate_lists=True),
+        dict(lazy=True),
+    ])
+    def test_close_files__closes_files_of_multiple_param(self, options,
+                                                         isolated_filesystem):
+        lazy = options.pop("lazy", False)
+
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            infiles = Param(type=click.File("r"), multiple=True, lazy=lazy)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            lazy_files = True
+        for name, value in options.items():
+            setattr(ConfigFileProcessor, name, value)
+
+        write_configfile_with_contents("alice.txt", "ALICE")
+        write_configfile_with_contents("bob.txt", "BOB")
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            infiles = alice.txt bob.txt
+            """)
+        storage = ConfigFileProcessor.read_config()
+        infiles = list(storage["infiles"])
+        assert [infile.read() for infile in infiles] == ["ALICE", "BOB"]
+
+        ConfigFileProcessor.close_files()
+        assert all(infile.closed for infile in infiles)
+
+    def test_lazy_file__inspecting_unused_file_does_not_open_it(self,
+                                                        isolated_filesystem):
+        import copy
+        import pickle
+        write_configfile_with_contents("out.txt", "KEEP")
+        outfile = LazyConfigFile("out.txt", "w")
+        assert not outfile.closed
+        assert outfile.name == "out.txt"
+        assert outfile.mode == "w"
+        assert not hasattr(outfile, "_missing")
+        copied = copy.copy(outfile)
+        assert not copied.opened
+        loaded = pickle.loads(pickle.dumps(outfile))
+        assert loaded.name == "out.txt"
+        assert not outfile.opened
+        with open("out.txt") as f:
+            assert f.read() == "KEEP"
+
+        outfile.close()
+        assert outfile.closed
+        with pytest.raises(ValueError):
+            outfile.write("OOPS")
+        with open("out.txt") as f:
+            assert f.read() == "KEEP"
+
+    # -- TESTS FOR: ConfigFileReader.config_fragment_dirs
+    def test_read_config__with_fragment_dirs_merges_in_lexical_order(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            number = Param(type=int)
+            flag = Param(type=bool)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            config_fragment_dirs = ["hello.d"]
+            fragment_cache = ParsedFileCache()
+
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+            number = 1
+            flag = no
+            """)
+        write_configfile_with_contents("hello.d/20_second.ini", """
+            [hello]
+            number = 20
+            """)
+        write_configfile_with_contents("hello.d/10_first.ini", """
+            [hello]
+            name = Bob
+            number = 10
+            """)
+        write_configfile_with_contents("hello.d/30_ignored.txt", """
+            [hello]
+            flag = yes
+            """)
+        storage = ConfigFileProcessor.read_config()
+        assert storage == dict(name="Bob", number=20, flag=False)
+
+        # -- FINGERPRINT CACHE: Unchanged fragments are not parsed again.
+        storage = ConfigFileProcessor.read_config()
+        assert storage == dict(name="Bob", number=20, flag=False)
+        assert ConfigFileProcessor.fragment_cache.misses == 2
+        assert ConfigFileProcessor.fragment_cache.hits == 2
+
+    def test_read_config__with_fragment_with_percent_sign(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            config_fragment_dirs = ["hello.d"]
+            fragment_cache = ParsedFileCache()
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Alice\n")
+        write_configfile_with_contents("hello.d/10_first.ini", """
+            [unused]
+            ratio = 100%
+            """)
+        storage = ConfigFileProcessor.read_config()
+        assert storage == dict(name="Alice")
+
+    # -- TESTS FOR: ConfigFileReader.config_includes
+    def test_read_config__with_includes(self, isolated_filesystem):
+        @matches_section("hello*")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            number = Param(type=int)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_sections = ["hello", "hello.*"]
+            config_section_schemas = [HelloSchema]
+            config_includes = True
+
+        write_configfile_with_contents("hello.ini", """
+            %include common/first.ini
+            [include]
+            files = common/second.ini
+
+            [hello]
+            name = Alice
+            """)
+        write_configfile_with_contents("common/first.ini", """
+            %include shared.ini
+            [hello]
+            name = NOT_USED
+            number = 1
+            """)
+        write_configfile_with_contents("common/second.ini", """
+            %include shared.ini
+            """)
+        write_configfile_with_contents("common/shared.ini", """
+            [hello.shared]
+            number = 42
+            """)
+        storage = ConfigFileProcessor.read_config()
+        assert storage == {
+            "name": "Alice", "number": 1,
+            "hello.shared": dict(number=42),
+        }
+
+    def test_read_config__with_include_cycle_raises_error(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            config_includes = True
+
+        write_configfile_with_contents("hello.ini", "%include other.ini\n")
+        write_configfile_with_contents("other.ini", "%include hello.ini\n")
+        with pytest.raises(ValueError) as exc_info:
+            ConfigFileProcessor.read_config()
+        assert "Include cycle:" in str(exc_info.value)
+
+    def test_read_config__with_missing_include_raises_error(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            config_includes = True
+
+        write_configfile_with_contents("hello.ini", "%include MISSING.ini\n")
+        with pytest.raises(ValueError) as exc_info:
+            ConfigFileProcessor.read_config()
+        message = str(exc_info.value)
+        assert "Include file not found:" in message
+        assert "MISSING.ini" in message
+        assert "hello.ini" in message
+
+    @pytest.mark.parametrize("max_depth, expected_error", [
+        (3, False), (2, True),
+    ])
+    def test_read_config__with_include_max_depth(self, max_depth,
+                                                 expected_error,
+                                                 isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            config_includes = True
+        ConfigFileProcessor.config_include_max_depth = max_depth
+
+        write_configfile_with_contents("hello.ini", "%include first.ini\n")
+        write_configfile_with_contents("first.ini", "%include second.ini\n")
+        write_configfile_with_contents("second.ini", """
+            [hello]
+            name = Alice
+            ratio = 100%
+            """)
+        if expected_error:
+            with pytest.raises(ValueError) as exc_info:
+                ConfigFileProcessor.read_config()
+            assert "Include depth exceeded (max: 2)" in str(exc_info.value)
+        else:
+            assert ConfigFileProcessor.read_config() == dict(name="Alice")
+
+    # -- TESTS FOR: ConfigFileReader.config_env_prefix
+    def test_read_config__with_env_overlay(self, isolated_filesystem,
+                                           monkeypatch):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            number = Param(type=int)
+
+        @matches_section("hello.more.*")
+        class HelloMoreSchema(SectionSchema):
+            numbers = Param(type=int, multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema, HelloMoreSchema]
+            config_env_prefix = "MY_APP"
+
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+            number = 1
+
+            [hello.more.foo]
+            numbers = 1 2
+            """)
+        monkeypatch.setenv("MY_APP_HELLO__NUMBER", "42")
+        monkeypatch.setenv("MY_APP_HELLO_MORE_FOO__NUMBERS", "3 4 5")
+        monkeypatch.setenv("MY_APP_HELLO_MORE_BAR__NUMBERS", "6")
+        monkeypatch.setenv("MY_APP_HELLO__UNKNOWN", "IGNORED")
+        storage = ConfigFileProcessor.read_config()
+        assert storage == {
+            "name": "Alice", "number": 42,
+            "hello.more.foo": dict(numbers=[3, 4, 5]),
+        }
+
+    # -- TESTS FOR: ConfigFileReader.read_config_from()
+    def test_read_config_from__with_many_source_types(self):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            number = Param(type=int)
+            flag = Param(type=bool)
+
+        @matches_section("hello.more.*")
+        class HelloMoreSchema(SectionSchema):
+            numbers = Param(type=int, multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_section_schemas = [HelloSchema, HelloMoreSchema]
+
+        sources = [
+            ("override.ini", memoryview(b"[hello]\nname = Alice\n")),
+            u"[hello]\nname = Bob\nnumber = 42\n",
+            io.BytesIO(b"[hello.more.foo]\nnumbers = 1 2\n"),
+            bytearray(b"[hello]\nflag = yes\nnumber = 1\n"),
+        ]
+        storage = ConfigFileProcessor.read_config_from(sources)
+        assert storage == {
+            "name": "Alice", "number": 42, "flag": True,
+            "hello.more.foo": dict(numbers=[1, 2]),
+        }
+
+    # -- TESTS FOR: ConfigFileReader.bulk_section_values
+    @pytest.mark.parametrize("bulk_section_values", [False, True])
+    def test_read_config__with_interpolation(self, bulk_section_values):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            greeting = Param(type=str)
+            ratio = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_section_schemas = [HelloSchema]
+        ConfigFileProcessor.bulk_section_values = bulk_section_values
+
+        storage = ConfigFileProcessor.read_config_from(["""
+            [DEFAULT]
+            name = Alice
+            [hello]
+            greeting = Hello %(name)s
+            ratio = 50%%
+            """])
+        assert storage == dict(name="Alice", greeting="Hello Alice",
+                               ratio="50%")
+
+    @pytest.mark.parametrize("bulk_section_values", [False, True])
+    def test_read_config__without_interpolation(self, bulk_section_values):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            greeting = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_section_schemas = [HelloSchema]
+            config_interpolation = False
+        ConfigFileProcessor.bulk_section_values = bulk_section_values
+
+        storage = ConfigFileProcessor.read_config_from(["""
+            [hello]
+            greeting = Hello %(name)s 100%
+            """])
+        assert storage == dict(greeting="Hello %(name)s 100%")
+
+    # -- TESTS FOR: ConfigFileReader.share_parsed_files
+    def test_read_config__with_share_parsed_files(self, isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            ratio = Param(type=str)
+
+        @matches_section("plugin")
+        class PluginSchema(SectionSchema):
+            number = Param(type=int)
+
+        class BaseConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            parsed_file_cache = ParsedFileCache()
+            share_parsed_files = True
+
+        class HelloConfigFileProcessor(BaseConfigFileProcessor):
+            config_section_schemas = [HelloSchema]
+
+        class PluginConfigFileProcessor(BaseConfigFileProcessor):
+            config_section_schemas = [PluginSchema]
+
+        write_configfile_with_contents("hello.ini", """
+            [DEFAULT]
+            name = Alice
+            [hello]
+            ratio = 50%%
+            [plugin]
+            number = 42
+            [unused]
+            text = 100%
+            """)
+        storage1 = HelloConfigFileProcessor.read_config()
+        storage2 = PluginConfigFileProcessor.read_config()
+        assert storage1 == dict(name="Alice", ratio="50%")
+        assert storage2 == dict(number=42)
+        parsed_file_cache = BaseConfigFileProcessor.parsed_file_cache
+        assert parsed_file_cache.misses == 1
+        assert parsed_file_cache.hits == 1
+
+    def test_parsed_file_cache__is_bounded_and_drops_missing_files(self,
+                                                        isolated_filesystem):
+        for name in ("alice", "bob", "charly"):
+            write_configfile_with_contents("%s.ini" % name,
+                                           "[hello]\nname = %s\n" % name)
+        parsed_file_cache = ParsedFileCache(maxsize=2)
+        parsed_file_cache.read("alice.ini")
+        parsed_file_cache.read("bob.ini")
+        parsed_file_cache.read("alice.ini")     # -- LRU: bob is evicted next.
+        parsed_file_cache.read("charly.ini")
+        basenames = [os.path.basename(filename)
+                     for filename in parsed_file_cache.filenames()]
+        assert basenames == ["alice.ini", "charly.ini"]
+
+        os.remove("alice.ini")
+        assert parsed_file_cache.prune() == 1
+        assert len(parsed_file_cache) == 1
+        os.remove("charly.ini")
+        with pytest.raises(OSError):
+            parsed_file_cache.read("charly.ini")
+        assert len(parsed_file_cache) == 0
+
+    # -- TESTS FOR: ConfigFileReader.for_root()
+    def test_for_root__reads_config_below_root(self, isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_searchpath = [".", "more"]
+            config_section_schemas = [HelloSchema]
+
+        write_configfile_with_contents("tenant1/hello.ini",
+                                       "[hello]\nname = Alice\n")
+        write_configfile_with_contents("tenant2/more/hello.ini",
+                                       "[hello]\nname = Bob\n")
+        reader1 = ConfigFileProcessor.for_root("tenant1")
+        reader2 = ConfigFileProcessor.for_root("tenant2")
+        assert reader1 is ConfigFileProcessor.for_root("tenant1")
+        assert issubclass(reader1, ConfigFileProcessor)
+        assert reader1.config_sections is ConfigFileProcessor.config_sections
+        assert reader1.read_config() == dict(name="Alice")
+        assert reader2.read_config() == dict(name="Bob")
+        assert ConfigFileProcessor.read_config() == {}
+
+    def test_for_root__reuses_storage_until_config_file_changes(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            root_reader_cache_size = 1
+
+        write_configfile_with_contents("tenant1/hello.ini",
+                                       "[hello]\nname = Alice\n")
+        reader1 = ConfigFileProcessor.for_root("tenant1")
+        storage1 = reader1.read_config()
+        assert reader1.read_config() is storage1
+
+        write_configfile_with_contents("tenant1/hello.ini",
+                                       "[hello]\nname = Alice2\n")
+        storage2 = reader1.read_config()
+        assert storage2 is not storage1
+        assert storage2 == dict(name="Alice2")
+
+        # -- LRU: Bounded number of root readers.
+        ConfigFileProcessor.for_root("tenant2")
+        assert ConfigFileProcessor.for_root("tenant1") is not reader1
+
+    def test_for_root__revalidates_included_files_and_env(self,
+                                                        isolated_filesystem,
+                                                        monkeypatch):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            number = Param(type=int)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            config_includes = True
+            config_env_prefix = "APP"
+
+        monkeypatch.delenv("APP_HELLO__NAME", raising=False)
+        write_configfile_with_contents("tenant/hello.ini",
+                                       "%include common.ini\n[hello]\n"
+                                       "name = Alice\n")
+        write_configfile_with_contents("tenant/common.ini",
+                                       "[hello]\nnumber = 1\n")
+        reader = ConfigFileProcessor.for_root("tenant")
+        assert reader.read_config() == dict(name="Alice", number=1)
+
+        write_configfile_with_contents("tenant/common.ini",
+                                       "[hello]\nnumber = 22\n")
+        assert reader.read_config() == dict(name="Alice", number=22)
+
+        monkeypatch.setenv("APP_HELLO__NAME", "Bob")
+        assert reader.read_config() == dict(name="Bob", number=22)
+
+    def test_for_root__with_ancestor_searchpath_starts_at_root(self,
+                                                        isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_searchpath = [AncestorSearchpath(markers=["ROOT"])]
+            config_section_schemas = [HelloSchema]
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = CWD\n")
+        write_configfile_with_contents("tenant/ROOT", "")
+        write_configfile_with_contents("tenant/sub/other.txt", "")
+        write_configfile_with_contents("tenant/hello.ini",
+                                       "[hello]\nname = Alice\n")
+        reader = ConfigFileProcessor.for_root("tenant/sub")
+        assert reader.read_config() == dict(name="Alice")
+
+    # -- TESTS FOR: ConfigFileReader.profile_conversions
+    def test_read_config__with_profile_conversions(self, isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            numbers = Param(type=int, multiple=True)
+
+        @matches_section("hello.more.*")
+        class HelloMoreSchema(SectionSchema):
+            numbers = Param(type=int, multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema, HelloMoreSchema]
+            profile_conversions = True
+
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+            numbers = 1 2 3
+
+            [hello.more.alice]
+            numbers = 4 5
+
+            [hello.more.bob]
+            numbers = 6
+            """)
+        ConfigFileProcessor.read_config()
+        profile = ConfigFileProcessor.stats["conversions"]
+        params = dict(((entry["schema"], entry["param"]), entry)
+                      for entry in profile["params"])
+        assert len(params) == 3
+        entry = params[(HelloMoreSchema.__qualname__, "numbers")]
+        assert entry["calls"] == 2
+        assert 0.0 <= entry["worst"] <= entry["total"]
+        totals = [entry["total"] for entry in profile["params"]]
+        assert totals == sorted(totals, reverse=True)
+        sections = [entry["section"] for entry in profile["sections"]]
+        assert sorted(sections) == ["hello", "hello.more.alice",
+                                    "hello.more.bob"]
+
+    def test_read_config__with_profile_conversions_and_batch_path_validation(
+            self, isolated_filesystem):
+        import time
+
+        class SlowPath(click.Path):
+            def convert(self, value, param, ctx):
+                time.sleep(0.02)
+                return super(SlowPath, self).convert(value, param, ctx)
+
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            files = Param(type=SlowPath(exists=True), multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            batch_path_validation = True
+            profile_conversions = True
+
+        write_configfile_with_contents("alice.txt", "ALICE")
+        write_configfile_with_contents("bob.txt", "BOB")
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            files = alice.txt bob.txt alice.txt
+            """)
+        ConfigFileProcessor.read_config()
+        entry = ConfigFileProcessor.stats["conversions"]["params"][0]
+        assert entry["param"] == "files"
+        assert entry["calls"] == 1
+        # -- BATCH VALIDATION TIME: Of 2 distinct values (alice.txt, bob.txt).
+        assert entry["total"] >= 0.04
+
+    # -- TESTS FOR: ConfigFileReader.memory_report
+    def test_read_config__with_memory_report(self, isolated_filesystem):
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        @matches_section("hello.more.*")
+        class HelloMoreSchema(SectionSchema):
+            numbers = Param(type=int, multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema, HelloMoreSchema]
+            memory_report = True
+
+        numbers = " ".join(str(number) for number in range(1000))
+        write_configfile_with_contents("hello.ini", """
+            [hello]
+            name = Alice
+
+            [hello.more.alice]
+            numbers = 1 2
+
+            [hello.more.bob]
+            numbers = %s
+            """ % numbers)
+        storage = ConfigFileProcessor.read_config()
+        report = ConfigFileProcessor.stats["memory"]
+        assert list(report["phases"].keys()) == ["discover", "parse", "process"]
+        assert report["phases"]["parse"]["peak"] > 0
+        assert report["storage"]["total"] == deep_size(storage)
+        assert set(report["storage"]["sections"].keys()) == set([
+            "", "hello.more.alice", "hello.more.bob"])
+        assert report["largest_sections"][0]["name"] == "hello.more.bob"
+        assert report["largest_values"][0]["name"] == "hello.more.bob.numbers"
+
+        summary = format_memory_report(report)
+        assert "LARGEST SECTIONS:\n  hello.more.bob" in summary
+        assert "(primary section)" in summary
+
+    def test_read_config__with_memory_report_stops_tracing_on_error(self,
+                                                        isolated_filesystem):
+        import tracemalloc
+
+        @matches_section("hello")
+        class HelloSchema(SectionSchema):
+            number = Param(type=int)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            memory_report = True
+
+        write_configfile_with_contents("hello.ini", "[hello]\nnumber = one\n")
+        assert not tracemalloc.is_tracing()
+        with pytest.raises(click.BadParameter):
+            ConfigFileProcessor.read_config()
+        assert not tracemalloc.is_tracing()
+
+    def test_deep_size__counts_shared_values_once(self):
+        value = ["x" * 1000]
+        size1 = deep_size([value])
+        assert size1 > 1000
+        assert deep_size([value, value]) < size1 + 1000
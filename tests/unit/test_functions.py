@@ -6,7 +6,8 @@ Unit tests for :class:`click_configfile.ConfigFileReader`.
 from __future__ import absolute_import, print_function
 import os.path
 from tests._test_support import write_configfile_with_contents
-from click_configfile import generate_configfile_names
+from click_configfile import generate_configfile_names, AncestorSearchpath
+from click_configfile import MissingFileCache, lazy_import
 import pytest
 
 
@@ -106,3 +107,127 @@ class TestFunction(object):
             os.path.join(".", "hello.ini"),
         ]
         assert actual_config_files == expected_config_files
+
+    # -- TESTS FOR: generate_configfile_names() with AncestorSearchpath
+    def test_generate_configfile_names__with_ancestor_searchpath(self, isolated_filesystem):
+        # -- SETUP:
+        EMPTY_CONTENTS = "# -- EMPTY\n"
+        write_configfile_with_contents("project/.git/HEAD", EMPTY_CONTENTS)
+        write_configfile_with_contents("project/hello.ini", EMPTY_CONTENTS)
+        write_configfile_with_contents("project/a/hello.ini", EMPTY_CONTENTS)
+        write_configfile_with_contents("project/a/b/c/hello.cfg", EMPTY_CONTENTS)
+        write_configfile_with_contents("hello.ini", EMPTY_CONTENTS)
+        here = os.path.abspath(".")
+
+        # -- PERFORM TEST:
+        searchpath = AncestorSearchpath(start="project/a/b/c",
+                                        markers=[".git"])
+        given_config_files = ["hello.ini", "hello.cfg"]
+        actual_config_files = list(generate_configfile_names(given_config_files,
+                                                             [searchpath]))
+        expected_config_files = [
+            os.path.join(here, "project", "hello.ini"),
+            os.path.join(here, "project", "a", "hello.ini"),
+            os.path.join(here, "project", "a", "b", "c", "hello.cfg"),
+        ]
+        assert actual_config_files == expected_config_files
+
+    def test_ancestor_searchpath__reuses_walk_of_nested_directory(self, isolated_filesystem):
+        write_configfile_with_contents("project/.git/HEAD", "")
+        write_configfile_with_contents("project/a/b/hello.ini", "")
+        here = os.path.abspath(".")
+        project_dir = os.path.join(here, "project")
+
+        searchpath = AncestorSearchpath(markers=[".git"])
+        directories1 = searchpath.directories("project/a/b")
+        assert directories1[-1] == project_dir
+
+        # -- MEMOIZED: New marker is not detected until the cache is cleared.
+        write_configfile_with_contents("project/a/.git/HEAD", "")
+        directories2 = searchpath.directories("project/a")
+        assert directories2 == directories1[1:]
+
+        searchpath.clear_cache()
+        directories3 = searchpath.directories("project/a")
+        assert directories3 == [os.path.join(project_dir, "a")]
+
+    def test_ancestor_searchpath__finds_config_file_created_later(self,
+                                                        isolated_filesystem):
+        write_configfile_with_contents("project/.git/HEAD", "")
+        write_configfile_with_contents("project/a/other.txt", "")
+        os.utime("project/a", (1000000, 1000000))
+        searchpath = AncestorSearchpath(start="project/a", markers=[".git"])
+        assert list(searchpath.generate_configfile_names(["hello.ini"])) == []
+
+        write_configfile_with_contents("project/a/hello.ini", "")
+        os.utime("project/a", (2000000, 2000000))
+        config_files = list(searchpath.generate_configfile_names(["hello.ini"]))
+        assert config_files == [os.path.abspath("project/a/hello.ini")]
+
+    # -- TESTS FOR: generate_configfile_names() with MissingFileCache
+    def test_generate_configfile_names__with_missing_cache(self, isolated_filesystem):
+        EMPTY_CONTENTS = "# -- EMPTY\n"
+        write_configfile_with_contents("hello.ini", EMPTY_CONTENTS)
+        missing_cache = MissingFileCache(ttl=3600)
+        given_config_files = ["hello.ini", "hello.cfg"]
+        expected_config_files = [os.path.join(".", "hello.ini")]
+        for _ in range(3):
+            actual_config_files = list(generate_configfile_names(
+                given_config_files, missing_cache=missing_cache))
+            assert actual_config_files == expected_config_files
+        assert missing_cache.is_missing(os.path.join(".", "hello.cfg"))
+        assert missing_cache.hits >= 2
+
+    def test_missing_cache__revalidates_with_directory_mtime(self, isolated_filesystem):
+        missing_cache = MissingFileCache(ttl=0)
+        missing_cache.add_missing(os.path.join("more", "hello.cfg"))
+        assert missing_cache.is_missing(os.path.join("more", "hello.cfg"))
+
+        # -- DIRECTORY CHANGED: Missing entries are discarded.
+        write_configfile_with_contents("more/hello.cfg", "# -- EMPTY\n")
+        assert not missing_cache.is_missing(os.path.join("more", "hello.cfg"))
+
+    def test_missing_cache__after_chdir_finds_file(self, isolated_filesystem):
+        missing_cache = MissingFileCache(ttl=3600)
+        write_configfile_with_contents("d2/hello.ini", "# -- EMPTY\n")
+        os.makedirs("d1")
+        here = os.getcwd()
+        try:
+            os.chdir("d1")
+            assert list(generate_configfile_names(
+                ["hello.ini"], missing_cache=missing_cache)) == []
+            os.chdir(os.path.join(here, "d2"))
+            assert list(generate_configfile_names(
+                ["hello.ini"], missing_cache=missing_cache)) == [
+                    os.path.join(".", "hello.ini")]
+        finally:
+            os.chdir(here)
+
+    def test_missing_cache__with_file_created_after_check(self,
+                                                        isolated_filesystem):
+        missing_cache = MissingFileCache(ttl=0)
+        os.makedirs("more")
+        os.utime("more", (1000000, 1000000))
+        directory_mtime = missing_cache.directory_mtime_of("more/hello.cfg")
+        # -- FILE CREATED: After the directory mtime was taken, before
+        #    the missing file is added (by the searching thread).
+        write_configfile_with_contents("more/hello.cfg", "# -- EMPTY\n")
+        os.utime("more", (2000000, 2000000))
+        missing_cache.add_missing("more/hello.cfg", directory_mtime)
+        assert not missing_cache.is_missing("more/hello.cfg")
+
+    def test_missing_cache__save_and_load(self, isolated_filesystem):
+        os.makedirs("more")
+        missing_cache = MissingFileCache()
+        missing_cache.add_missing(os.path.join("more", "hello.cfg"))
+        missing_cache.save("missing_cache.json")
+
+        missing_cache2 = MissingFileCache()
+        assert missing_cache2.load("missing_cache.json")
+        assert missing_cache2.is_missing(os.path.join("more", "hello.cfg"))
+
+    # -- TESTS FOR: lazy_import()
+    def test_lazy_import__provides_cached_function(self):
+        from fnmatch import fnmatch
+        assert lazy_import("fnmatch", "fnmatch") is fnmatch
+        assert lazy_import("fnmatch", "fnmatch") is fnmatch
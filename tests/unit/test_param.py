@@ -4,7 +4,9 @@ Unit tests for :class:`click_configfile.Param`.
 """
 
 from __future__ import absolute_import, print_function
-from click_configfile import Param
+from click_configfile import Param, ConversionCache, is_cacheable_type
+from click_configfile import LazySequence
+import click
 import click.types
 import pytest
 
@@ -22,3 +24,99 @@ class TestParam(object):
     def test_ctor__without_help_attribute(self):
         param = Param()
         assert param.help is None
+
+
+class TestConversionCache(object):
+
+    def test_parse__with_cache_reuses_conversion_result(self):
+        cache = ConversionCache(maxsize=10)
+        param = Param(type=int, multiple=True, cache=cache)
+        assert param.parse("1 2 1 2 1") == [1, 2, 1, 2, 1]
+        assert cache.stats() == dict(hits=3, misses=2, size=2, maxsize=10)
+
+    def test_parse__without_cache_is_default(self):
+        param = Param(type=int)
+        assert param.conversion_cache is None
+        assert param.parse("42") == 42
+
+    def test_parse__with_non_cacheable_type_bypasses_cache(self):
+        cache = ConversionCache()
+        param = Param(type=click.Path(), cache=cache)
+        assert not is_cacheable_type(param.type)
+        assert param.parse("foo.txt") == "foo.txt"
+        assert cache.stats()["misses"] == 0
+        assert len(cache) == 0
+
+    def test_parse__with_type_declared_cacheable_uses_cache(self):
+        cache = ConversionCache()
+        path_type = click.Path()
+        path_type.cacheable = True
+        param = Param(type=path_type, cache=cache)
+        param.parse("foo.txt")
+        param.parse("foo.txt")
+        assert cache.stats()["hits"] == 1
+
+    def test_convert__evicts_least_recently_used_entries(self):
+        cache = ConversionCache(maxsize=2)
+        param = Param(type=int, cache=cache)
+        param.parse("1")
+        param.parse("2")
+        param.parse("1")    # -- MARK: "1" as most recently used.
+        param.parse("3")    # -- EVICTS: "2"
+        assert len(cache) == 2
+        param.parse("1")
+        assert cache.hits == 2
+        param.parse("2")
+        assert cache.misses == 4
+
+
+class TestLazySequence(object):
+
+    def test_parse__with_lazy_provides_lazy_sequence(self):
+        param = Param(type=int, multiple=True, lazy=True)
+        values = param.parse("\n  1 4\n\t9 16  \n25\n")
+        assert isinstance(values, LazySequence)
+        assert len(values) == 5
+        assert values == [1, 4, 9, 16, 25]
+        assert values[1] == 4
+        assert values[-1] == 25
+        assert values[1:3] == [4, 9]
+        assert 9 in values
+        assert 10 not in values
+
+    def test_getitem__converts_on_access(self):
+        converted = []
+        def convert(text):
+            converted.append(text)
+            return int(text)
+
+        values = LazySequence("1 2 3", convert)
+        assert converted == []
+        assert values[2] == 3
+        assert converted == ["3"]
+        with pytest.raises(IndexError):
+            values[3]
+
+    def test_getitem__with_bad_value_raises_error_on_access(self):
+        param = Param(name="numbers", type=int, multiple=True, lazy=True)
+        values = param.parse("1 two 3")
+        assert values[0] == 1
+        with pytest.raises(click.BadParameter):
+            values[1]
+
+    def test_contains__with_cache_membership_converts_once(self):
+        converted = []
+        def convert(text):
+            converted.append(text)
+            return text
+
+        values = LazySequence("alice bob charly", convert,
+                              cache_membership=True)
+        assert "bob" in values
+        assert "dora" not in values
+        assert len(converted) == 3
+
+    def test_empty_text__provides_empty_sequence(self):
+        values = LazySequence("  \n ", int)
+        assert len(values) == 0
+        assert list(values) == []
@@ -0,0 +1,545 @@
+# -*- coding: UTF-8 -*-
+"""
+Unit tests for the storage variants of :class:`click_configfile.ConfigFileReader`.
+"""
+
+from __future__ import absolute_import, print_function
+from collections import OrderedDict
+from tests._test_support import write_configfile_with_contents
+from click_configfile import Param, SectionSchema, ConfigFileReader
+from click_configfile import SectionRecord, make_default_map, \
+    make_section_record_class
+from click_configfile import SectionColumns, SectionQuery, ValueDeduplicator
+from click_configfile import ConfigSnapshotHolder, freeze_storage
+from click_configfile import SectionRouter
+from click_configfile import matches_section
+import pytest
+
+
+# -----------------------------------------------------------------------------
+# TEST CANDIDATE:
+# -----------------------------------------------------------------------------
+class ConfigSectionSchema(object):
+
+    @matches_section("hello")
+    class Hello(SectionSchema):
+        name = Param(type=str)
+
+    @matches_section("hello.host.*")
+    class HelloHost(SectionSchema):
+        port = Param(type=int)
+        role = Param(type=str)
+        enabled = Param(type=bool, default=True)
+
+
+CONFIG_FILE_CONTENTS = """
+    [hello]
+    name = Alice
+
+    [hello.host.alice]
+    port = 8000
+    role = db
+    enabled = no
+
+    [hello.host.bob]
+    port = 8001
+    role = web
+    """
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE
+# -----------------------------------------------------------------------------
+class TestSectionRecord(object):
+
+    def test_read_config__with_section_records(self, isolated_filesystem):
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [
+                ConfigSectionSchema.Hello,
+                ConfigSectionSchema.HelloHost,
+            ]
+            section_records = True
+
+        write_configfile_with_contents("hello.ini", CONFIG_FILE_CONTENTS)
+        storage = ConfigFileProcessor.read_config()
+        alice = storage["hello.host.alice"]
+        bob = storage["hello.host.bob"]
+        assert storage["name"] == "Alice"
+        assert isinstance(alice, SectionRecord)
+        assert type(alice) is type(bob)
+        assert not hasattr(alice, "__dict__")
+        assert alice.port == 8000
+        assert alice["role"] == "db"
+        assert alice == dict(port=8000, role="db", enabled=False)
+        assert bob == dict(port=8001, role="web", enabled=True)
+
+    def test_read_config__with_section_records_merges_sections(
+            self, isolated_filesystem):
+        @matches_section("hello.*")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+            port = Param(type=int)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HelloSchema]
+            section_records = True
+
+            @classmethod
+            def get_storage_name_for(cls, section_name):
+                return "hello"  # -- SAME STORAGE NAME: For all sections.
+
+        write_configfile_with_contents("hello.ini", """
+            [hello.a]
+            name = Alice
+
+            [hello.b]
+            port = 8000
+            """)
+        storage = ConfigFileProcessor.read_config()
+        assert isinstance(storage["hello"], SectionRecord)
+        assert storage["hello"] == dict(name="Alice", port=8000)
+
+    def test_record__with_missing_param_behaves_like_dict(self):
+        @matches_section("foo")
+        class FooSchema(SectionSchema):
+            alice = Param(type=str)
+            bob = Param(type=str)
+
+        record_class = make_section_record_class(FooSchema)
+        record = record_class(alice="ALICE")
+        assert "alice" in record
+        assert "bob" not in record
+        assert list(record) == ["alice"]
+        assert len(record) == 1
+        with pytest.raises(KeyError):
+            _ = record["bob"]
+
+    def test_make_default_map__provides_mapping_for_click(self):
+        @matches_section("foo")
+        class FooSchema(SectionSchema):
+            number = Param(type=int)
+
+        record_class = make_section_record_class(FooSchema)
+        storage = dict(name="Alice", foo=record_class(number=42))
+        default_map = make_default_map(storage)
+        assert default_map["name"] == "Alice"
+        assert default_map["foo"].get("number") == 42
+        assert default_map["foo"].get("unknown") is None
+        assert dict(default_map["foo"]) == dict(number=42)
+
+
+class TestSectionColumns(object):
+
+    def test_read_config__with_section_columns(self, isolated_filesystem):
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [
+                ConfigSectionSchema.Hello,
+                ConfigSectionSchema.HelloHost,
+            ]
+            section_columns = True
+
+        write_configfile_with_contents("hello.ini", CONFIG_FILE_CONTENTS)
+        storage = ConfigFileProcessor.read_config()
+        hosts = storage["hello.host.*"]
+        assert storage["name"] == "Alice"
+        assert isinstance(hosts, SectionColumns)
+        assert list(hosts) == ["hello.host.alice", "hello.host.bob"]
+        assert hosts.column("port") == [8000, 8001]
+        assert hosts.column("enabled") == [False, True]
+        assert hosts.where(role="db") == ["hello.host.alice"]
+        assert hosts.filter("port", lambda port: port > 8000) == [
+            "hello.host.bob"]
+        assert hosts["hello.host.bob"]["role"] == "web"
+        assert dict(hosts["hello.host.alice"]) == dict(
+            port=8000, role="db", enabled=False)
+
+        # -- DICT-STYLE ACCESS: Per section (like without section_columns).
+        assert storage["hello.host.alice"]["port"] == 8000
+        assert storage["hello.host.bob"].get("role") == "web"
+        assert dict(storage["hello.host.alice"]) == dict(
+            port=8000, role="db", enabled=False)
+
+    def test_row_view__with_missing_param(self):
+        columns = SectionColumns(ConfigSectionSchema.HelloHost)
+        columns.add("alice", dict(port=80))
+        columns.add("bob", dict(port=81, role="db"))
+        alice = columns["alice"]
+        assert "role" not in alice
+        assert alice.get("role") is None
+        assert columns.column("role", default="?") == ["?", "db"]
+        assert columns.where(role="db") == ["bob"]
+
+
+class TestSectionQuery(object):
+
+    def test_read_config__with_query_uses_indexes(self, isolated_filesystem):
+        @matches_section("host.*")
+        class HostSchema(SectionSchema):
+            role = Param(type=str, indexed=True)
+            region = Param(type=str, indexed=True)
+            tags = Param(type=str, multiple=True, indexed=True)
+            port = Param(type=int)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HostSchema]
+
+        write_configfile_with_contents("hello.ini", """
+            [host.alice]
+            role = db
+            region = eu-1
+            tags = fast ssd
+            port = 8000
+
+            [host.bob]
+            role = db
+            region = us-1
+            port = 8001
+
+            [host.charly]
+            role = web
+            region = eu-2
+            tags = ssd
+            port = 8002
+            """)
+        query = SectionQuery()
+        ConfigFileProcessor.read_config(query=query)
+        assert set(query.indexes) == set(["role", "region", "tags"])
+        assert query.find(role="db") == set(["host.alice", "host.bob"])
+        assert query.find(role="db", region={"eu-1", "eu-2"}) == set([
+            "host.alice"])
+        assert query.find(tags="ssd") == set(["host.alice", "host.charly"])
+        assert query.find(port=8002) == set(["host.charly"])
+        assert query.find(role="unknown") == set()
+        assert query["host.bob"]["port"] == 8001
+
+        # -- RELOAD: Indexes are updated.
+        write_configfile_with_contents("hello.ini", """
+            [host.alice]
+            role = web
+            region = eu-1
+            """)
+        ConfigFileProcessor.read_config(query=query)
+        assert query.find(role="db") == set()
+        assert query.find(role="web") == set(["host.alice"])
+        assert "host.bob" not in query
+        assert query.indexes["tags"] == {}
+
+    def test_find__with_param_indexed_in_other_schema(self,
+                                                      isolated_filesystem):
+        @matches_section("a.*")
+        class IndexedSchema(SectionSchema):
+            role = Param(type=str, indexed=True)
+
+        @matches_section("b.*")
+        class OtherSchema(SectionSchema):
+            role = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [IndexedSchema, OtherSchema]
+
+        write_configfile_with_contents("hello.ini", """
+            [a.x]
+            role = db
+
+            [b.y]
+            role = db
+
+            [b.z]
+            role = web
+            """)
+        query = SectionQuery()
+        ConfigFileProcessor.read_config(query=query)
+        assert query.find(role="db") == set(["a.x", "b.y"])
+        assert query.find(role={"web"}) == set(["b.z"])
+
+    def test_find__with_unindexed_section_added_before_index(self):
+        query = SectionQuery()
+        query.update_section("b.y", dict(role="db"))
+        query.update_section("a.x", dict(role="db"), ["role"])
+        query.update_section("a.z", dict(role="web"), ["role"])
+        assert query.find(role="db") == set(["a.x", "b.y"])
+
+        query.remove_section("b.y")
+        assert query.unindexed_sections["role"] == set()
+        assert query.find(role="db") == set(["a.x"])
+
+    def test_find__with_indexed_params_does_not_iterate_sections(self):
+        class NonIterableSections(OrderedDict):
+            def __iter__(self):
+                raise AssertionError("find() iterates all sections")
+
+        query = SectionQuery()
+        for index in range(100):
+            query.update_section("host.%d" % index,
+                                 dict(role="db%d" % index, region="eu"),
+                                 ["role", "region"])
+        query.sections = NonIterableSections(query.sections)
+        assert query.find(role="db7") == set(["host.7"])
+        assert query.find(role="db7", region="eu") == set(["host.7"])
+
+
+class TestValueDeduplication(object):
+
+    def test_read_config__with_deduplicate_values(self, isolated_filesystem):
+        @matches_section("host.*")
+        class HostSchema(SectionSchema):
+            region = Param(type=str)
+            paths = Param(type=str, multiple=True)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [HostSchema]
+            deduplicate_values = True
+            deduplicate_lists = True
+
+        write_configfile_with_contents("hello.ini", """
+            [host.alice]
+            region = eu-central-1
+            paths = /srv/data /srv/logs
+
+            [host.bob]
+            region = eu-central-1
+            paths = /srv/data /srv/logs
+            """)
+        storage = ConfigFileProcessor.read_config()
+        alice = storage["host.alice"]
+        bob = storage["host.bob"]
+        assert alice == dict(region="eu-central-1",
+                             paths=("/srv/data", "/srv/logs"))
+        assert alice["region"] is bob["region"]
+        assert alice["paths"] is bob["paths"]
+
+        stats = ConfigFileProcessor.stats["dedup"]
+        assert stats["deduplicated"] >= 2
+        assert stats["bytes_saved"] > 0
+
+    def test_deduplicate__keeps_values_of_other_types_apart(self):
+        deduplicator = ValueDeduplicator()
+        assert type(deduplicator.deduplicate(1)) is int
+        assert type(deduplicator.deduplicate(True)) is bool
+        assert type(deduplicator.deduplicate(1.0)) is float
+        values = [1, True]
+        assert deduplicator.deduplicate(values) is values
+
+    def test_deduplicate__keeps_signed_zero_and_nested_types(self):
+        import math
+        deduplicator = ValueDeduplicator(share_lists=True)
+        assert math.copysign(1.0, deduplicator.deduplicate(0.0)) == 1.0
+        assert math.copysign(1.0, deduplicator.deduplicate(-0.0)) == -1.0
+
+        value1 = deduplicator.deduplicate((1, (1,)))
+        value2 = deduplicator.deduplicate((1, (True,)))
+        assert type(value2[1][0]) is bool
+        assert value1 is not value2
+        value3 = deduplicator.deduplicate(frozenset([True]))
+        assert type(next(iter(deduplicator.deduplicate(frozenset([1]))))) \
+            is int
+        assert type(next(iter(value3))) is bool
+
+
+class TestConfigSnapshotHolder(object):
+
+    def test_freeze_storage__provides_read_only_copy(self):
+        storage = dict(name="Alice", numbers=[1, 2], more=dict(bob=dict(x=1)))
+        snapshot = freeze_storage(storage)
+        assert snapshot == dict(name="Alice", numbers=(1, 2),
+                                more=dict(bob=dict(x=1)))
+        with pytest.raises(TypeError):
+            snapshot["name"] = "Bob"
+        with pytest.raises(TypeError):
+            snapshot["more"]["bob"]["x"] = 2
+        storage["name"] = "Bob"
+        assert snapshot["name"] == "Alice"
+
+    def test_freeze_storage__with_section_record_fails(self):
+        record_class = make_section_record_class(ConfigSectionSchema.HelloHost)
+        storage = dict(alice=record_class(port=8000))
+        with pytest.raises(ValueError):
+            freeze_storage(storage)
+
+    @pytest.mark.parametrize("storage_mode", [
+        "section_records", "section_columns"])
+    def test_init__with_mutable_storage_mode_fails(self, storage_mode):
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [ConfigSectionSchema.Hello]
+        setattr(ConfigFileProcessor, storage_mode, True)
+
+        with pytest.raises(ValueError):
+            ConfigSnapshotHolder(ConfigFileProcessor)
+
+    def test_reload__swaps_snapshot(self, isolated_filesystem):
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [ConfigSectionSchema.Hello]
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Alice\n")
+        holder = ConfigSnapshotHolder(ConfigFileProcessor)
+        snapshot1 = holder.get()
+        assert snapshot1 == dict(name="Alice")
+        assert holder.get() is snapshot1
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Bob\n")
+        holder.reload_in_background().join()
+        assert holder.snapshot == dict(name="Bob")
+        assert holder.version == 2
+        assert snapshot1 == dict(name="Alice")
+
+    def test_reload__with_invalid_storage_keeps_snapshot(self,
+                                                         isolated_filesystem):
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["hello.ini"]
+            config_section_schemas = [ConfigSectionSchema.Hello]
+
+        def validate(storage):
+            if not storage.get("name"):
+                raise ValueError("name is missing")
+
+        write_configfile_with_contents("hello.ini", "[hello]\nname = Alice\n")
+        holder = ConfigSnapshotHolder(ConfigFileProcessor, validate=validate)
+        snapshot1 = holder.reload()
+        write_configfile_with_contents("hello.ini", "[hello]\n")
+        holder.reload_in_background().join()
+        assert holder.snapshot is snapshot1
+        assert isinstance(holder.last_error, ValueError)
+
+
+class TestSectionRouter(object):
+
+    def test_route__selects_schema_by_segments(self):
+        @matches_section(["svc", "svc.*"])
+        class ServiceSchema(SectionSchema):
+            name = Param(type=str)
+
+        @matches_section("svc.*.*.host")
+        class ServiceHostSchema(SectionSchema):
+            port = Param(type=int)
+
+        router = SectionRouter([ServiceHostSchema, ServiceSchema])
+        assert router.route("svc.eu.c1.host") is ServiceHostSchema
+        assert router.route("svc") is ServiceSchema
+        assert router.route("svc.eu") is ServiceSchema
+        assert router.route("svc.eu.c1") is ServiceSchema
+        assert router.route("other") is None
+
+    def test_route__with_inner_wildcard_matches_like_fnmatch(self):
+        router = SectionRouter()
+        router.add("svc.*.host", "host")
+        assert router.route("svc.eu.host") == "host"
+        assert router.route("svc.eu.c1.host") == "host"
+        assert router.route("svc.eu.c1.other") is None
+
+    def test_route__with_custom_matches_section(self):
+        @matches_section("hello.*")
+        class HelloSchema(SectionSchema):
+            name = Param(type=str)
+
+        class CustomSchema(SectionSchema):
+            @classmethod
+            def matches_section(cls, section_name, supported_section_names=None):
+                return section_name.endswith(".custom")
+
+        router = SectionRouter([CustomSchema, HelloSchema])
+        assert router.route("hello.alice") is HelloSchema
+        assert router.route("hello.alice.custom") is CustomSchema
+        assert router.route("other.custom") is CustomSchema
+        assert router.route("other") is None
+
+    def test_route__prefers_first_target(self):
+        router = SectionRouter()
+        router.add("hello.*", "first")
+        router.add("hello.alice", "second")
+        assert router.route("hello.alice") == "first"
+        assert router.route("hello.bob.more") == "first"
+        assert router.targets == ["first", "second"]
+
+    @pytest.mark.parametrize("section_name", [
+        "hello", "hello.host.alice", "hello.host.alice.more", "hello.other",
+        "hello.host", "other.host.alice",
+    ])
+    def test_route__with_last_segment_pattern_is_like_fnmatch(self,
+                                                             section_name):
+        schemas = [ConfigSectionSchema.Hello, ConfigSectionSchema.HelloHost]
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_section_schemas = schemas
+
+        class RoutingConfigFileProcessor(ConfigFileProcessor):
+            section_router = True
+
+        expected = ConfigFileProcessor.select_config_schema_for(section_name)
+        actual = RoutingConfigFileProcessor.select_config_schema_for(
+            section_name)
+        assert actual is expected
+
+    def test_read_config__with_nested_storage(self, isolated_filesystem):
+        @matches_section("svc")
+        class ServiceSchema(SectionSchema):
+            name = Param(type=str)
+
+        @matches_section("svc.*.*.host")
+        class ServiceHostSchema(SectionSchema):
+            port = Param(type=int)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["svc.ini"]
+            config_section_schemas = [ServiceSchema, ServiceHostSchema]
+            section_router = True
+            nested_storage = True
+
+        write_configfile_with_contents("svc.ini", """
+            [svc]
+            name = Alice
+
+            [svc.eu.c1.host]
+            port = 8000
+
+            [svc.eu.c2.host]
+            port = 8001
+
+            [svc.eu.c2.other]
+            port = 8002
+            """)
+        storage = ConfigFileProcessor.read_config()
+        assert storage == dict(name="Alice", svc=dict(eu=dict(
+            c1=dict(host=dict(port=8000)),
+            c2=dict(host=dict(port=8001)))))
+        assert ConfigFileProcessor.get_storage_path_for("svc.eu.c1.host") == \
+            ("svc", "eu", "c1", "host")
+
+    @pytest.mark.parametrize("contents", [
+        "[svc.eu.c1]\nport = 1\n[svc.eu]\nc1 = X\n",
+        "[svc.eu]\nc1 = X\n[svc.eu.c1]\nport = 1\n",
+    ])
+    def test_read_config__with_nested_storage_conflict_raises_error(self,
+                                                contents, isolated_filesystem):
+        @matches_section(["svc.*"])
+        class ServiceSchema(SectionSchema):
+            port = Param(type=int)
+            c1 = Param(type=str)
+
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["svc.ini"]
+            config_section_schemas = [ServiceSchema]
+            nested_storage = True
+
+        write_configfile_with_contents("svc.ini", contents)
+        with pytest.raises(ValueError) as exc_info:
+            ConfigFileProcessor.read_config()
+        assert "conflicts with param 'c1'" in str(exc_info.value)
+
+    def test_read_config__with_nested_storage_and_records_raises_error(self,
+                                                        isolated_filesystem):
+        class ConfigFileProcessor(ConfigFileReader):
+            config_files = ["svc.ini"]
+            config_section_schemas = [ConfigSectionSchema.Hello]
+            nested_storage = True
+            section_records = True
+
+        with pytest.raises(ValueError):
+            ConfigFileProcessor.read_config()